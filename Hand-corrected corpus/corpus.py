@@ -0,0 +1,320 @@
+#This module reads in Corpus.txt, turning each line into a Verb
+#with named fields, rather than a list of 25 strings. The seven
+#forms of each verb are Forms, which store their phonology and
+#gloss as tuples of morphemes, and the indices of the morphemes that
+#carry stress, so that these don't have to be looked up every time a
+#prediction is checked. Coalescence with the dynamic marker
+#is undone once, as each verb is read in.
+#The corpus can also be compiled into a binary file, which loads
+#much faster, since nothing has to be parsed: every string is
+#stored once in a table, and everything else is arrays of integers
+#(mostly indices into that table). The file is read with mmap, and
+#each Verb is only made from it when it's asked for, so a process
+#only keeps the strings it has decoded, not a copy of the whole
+#corpus, and processes reading the same file share the pages the
+#system has loaded. Compile it with:
+#python corpus.py [Corpus.txt] [Corpus.bin]
+import sys
+import mmap
+import hashlib
+from array import array
+
+#The stressed vowels in the phonology. A, Y are the ones in the
+#corpus; V is what they become once a root or preverb is broken up
+#into elements (see parseElements in dybo.py).
+stressedVowels = ["A", "Y", "V", "G", "E"]
+
+#The order of the seven forms in each line of the corpus
+formNames = ["masdar", "present affirmative", "present negative", "imperative affirmative", "imperative negative", "absolutive affirmative", "absolutive negative"]
+
+#Many forms have exactly the same glosses or phonology, so each
+#tuple of morphemes is only stored once, the first time we see it
+sharedTuples = {}
+
+def share(morphemes):
+
+    return sharedTuples.setdefault(morphemes, morphemes)
+
+#This function takes a hyphenated string (e.g. C1-R-ABS), and
+#returns it as a tuple of morphemes. Glosses and phonological
+#shapes come from a small set, so each one is only stored once.
+def splitMorphemes(s):
+
+    return share(tuple([sys.intern(m) for m in s.split("-")]))
+
+#This function takes a tuple of morphemes in the phonology, and
+#returns the indices of the ones with a stressed vowel, as a
+#frozenset. A prediction is right if it stresses any of them.
+def getStressIndices(phonology):
+
+    return frozenset([j for j in range(len(phonology)) if any([x in phonology[j] for x in stressedVowels])])
+
+#One form of a verb. The orthography is only there for people to
+#read, so it's kept as a string.
+class Form:
+
+    __slots__ = ["orthography", "phonology", "glosses", "stressIndices"]
+
+    def __init__(self, orthography, phonology, glosses, stressIndices):
+
+        self.orthography = orthography
+        self.phonology = phonology
+        self.glosses = glosses
+        self.stressIndices = stressIndices
+
+    #Change the phonology and glosses (e.g. once the root has been
+    #broken up into elements), given as hyphenated strings
+    def setMorphemes(self, phonology, glosses):
+
+        self.phonology = splitMorphemes(phonology)
+        self.glosses = splitMorphemes(glosses)
+        self.stressIndices = getStressIndices(self.phonology)
+
+#One verb: its seven forms, the gloss string of its category (e.g.
+#C1-PREV-R), the information about its stress, its translation, and
+#whether it's a causative
+class Verb:
+
+    __slots__ = ["forms", "glossString", "stressInfo", "translation", "causative"]
+
+    def __init__(self, forms, glossString, stressInfo, translation, causative):
+
+        self.forms = forms
+        self.glossString = glossString
+        self.stressInfo = stressInfo
+        self.translation = translation
+        self.causative = causative
+
+    #The masdar, as it's written, to tell the user which verb this is
+    def name(self):
+
+        return self.forms[0].orthography
+
+#This function takes a line of the corpus, and returns a Verb
+def parseVerb(line):
+
+    columns = line.split("\t")
+
+    #Undo coalescence with the dynamic marker in the present
+    #affirmative and negative, if the verb has it
+    if "R.DYN" in columns[5]:
+
+        for i in [3, 6]:
+
+            #Orthography (stressed/unstressed)
+            columns[i] = columns[i].replace("О", "а-уА")
+            columns[i] = columns[i].replace("о", "а-уа")
+
+            #Phonology (stressed/unstressed)
+            columns[i + 1] = columns[i + 1].replace("O", "a-CA")
+            columns[i + 1] = columns[i + 1].replace("o", "a-Ca")
+
+            #Gloss
+            columns[i + 2] = columns[i + 2].replace("R.DYN", "R-DYN")
+
+    #Each form has three columns: orthography, phonology, gloss
+    forms = []
+
+    for i in range(0, 21, 3):
+
+        phonology = splitMorphemes(columns[i + 1])
+        forms.append(Form(columns[i], phonology, splitMorphemes(columns[i + 2]), getStressIndices(phonology)))
+
+    return Verb(tuple(forms), sys.intern(columns[21]), columns[22], columns[23], columns[24] == "Y")
+
+#The binary format starts with these bytes, so we can tell it apart
+#from the text format. The integers are in this machine's byte
+#order, which is recorded too.
+magic = b"ABKV" + sys.byteorder[0].encode("ascii")
+
+#This function takes a list of Verbs, and writes them to a binary
+#file. After the header, the file has these sections, all made of
+#4-byte unsigned integers except the text of the strings:
+#1) the offset of every string in the text, plus the end
+#2) the text of every string, in UTF-8, padded to 4 bytes
+#3) for each verb: glossString, stressInfo, translation, causative
+#4) for each form: orthography, phonology, glosses, and the stressed
+#   morphemes, as a bit mask (bit j set if morpheme j is stressed)
+#5) for each tuple of morphemes: where it starts in section 6,
+#   and how many morphemes it has
+#6) the morphemes of every tuple, one after the other
+#Strings are stored as their index in the string table, and the
+#phonology and glosses of a form as the index of their tuple of
+#morphemes. Like in memory, each string and each tuple of
+#morphemes is only stored once.
+def writeBinary(verbs, path):
+
+    strings = {}
+    tuples = {}
+    verbTable = array("I")
+    formTable = array("I")
+    tupleTable = array("I")
+    morphemeIds = array("I")
+
+    for verb in verbs:
+
+        for s in [verb.glossString, verb.stressInfo, verb.translation]:
+
+            verbTable.append(strings.setdefault(s, len(strings)))
+
+        verbTable.append(int(verb.causative))
+
+        for form in verb.forms:
+
+            formTable.append(strings.setdefault(form.orthography, len(strings)))
+
+            for morphemes in [form.phonology, form.glosses]:
+
+                #Add the tuple if we haven't seen it before
+                if morphemes not in tuples:
+
+                    tuples[morphemes] = len(tuples)
+                    tupleTable.extend([len(morphemeIds), len(morphemes)])
+                    morphemeIds.extend([strings.setdefault(m, len(strings)) for m in morphemes])
+
+                formTable.append(tuples[morphemes])
+
+            #Each mask is one 4-byte integer
+            if form.stressIndices and max(form.stressIndices) >= 32:
+
+                raise ValueError(f"{form.orthography} has too many morphemes for the binary format")
+
+            formTable.append(sum([1 << j for j in form.stressIndices]))
+
+    offsets = array("I", [0])
+    text = bytearray()
+
+    for s in strings:
+
+        text += s.encode("utf-8")
+        offsets.append(len(text))
+
+    text += bytes(-len(text) % 4)
+    header = array("I", [len(strings), len(text), len(verbs), len(tuples), len(morphemeIds)])
+
+    with open(path, mode = "wb") as f:
+
+        f.write(magic + bytes(8 - len(magic)))
+
+        for section in [header, offsets, text, verbTable, formTable, tupleTable, morphemeIds]:
+
+            f.write(section)
+
+#A binary corpus, opened with mmap, which can be used like a list of
+#Verbs. The integer sections are used straight from the file, and
+#each string and tuple of morphemes is only decoded the first time
+#it's needed. Every time a verb is asked for, a new Verb is made, so
+#changing it (e.g. with prepareVerb in dybo.py) doesn't change the
+#corpus.
+class BinaryCorpus:
+
+    def __init__(self, path):
+
+        with open(path, mode = "rb") as f:
+
+            self.map = mmap.mmap(f.fileno(), 0, access = mmap.ACCESS_READ)
+
+        if not self.map[:len(magic)] == magic:
+
+            raise ValueError(f"{path} is not a binary corpus written on a machine like this one")
+
+        data = memoryview(self.map)
+        numStrings, textLength, numVerbs, numTuples, numMorphemes = data[8:28].cast("I")
+        position = 28
+        sections = []
+
+        #Cut the file up into its sections
+        for length, size in [(numStrings + 1, 4), (textLength, 1), (numVerbs * 4, 4), (numVerbs * 7 * 4, 4), (numTuples * 2, 4), (numMorphemes, 4)]:
+
+            section = data[position:position + length * size]
+            sections.append(section.cast("I") if size == 4 else section)
+            position += length * size
+
+        self.offsets, self.text, self.verbTable, self.formTable, self.tupleTable, self.morphemeIds = sections
+        self.strings = [None] * numStrings
+        self.tuples = [None] * numTuples
+        self.numVerbs = numVerbs
+
+    def __len__(self):
+
+        return self.numVerbs
+
+    def __getitem__(self, n):
+
+        if not 0 <= n < self.numVerbs:
+
+            raise IndexError(f"There is no verb {n} in the corpus")
+
+        return self.verb(n)
+
+    #Return the string with some index in the string table
+    def string(self, i):
+
+        if self.strings[i] is None:
+
+            self.strings[i] = sys.intern(str(self.text[self.offsets[i]:self.offsets[i + 1]], "utf-8"))
+
+        return self.strings[i]
+
+    #Return the tuple of morphemes with some index in section 5
+    def morphemes(self, i):
+
+        if self.tuples[i] is None:
+
+            start, count = self.tupleTable[2 * i:2 * i + 2]
+            self.tuples[i] = share(tuple([self.string(m) for m in self.morphemeIds[start:start + count]]))
+
+        return self.tuples[i]
+
+    #Return the nth verb as a Verb
+    def verb(self, n):
+
+        glossString, stressInfo, translation, causative = self.verbTable[4 * n:4 * n + 4]
+        forms = []
+
+        for k in range(7 * n, 7 * n + 7):
+
+            orthography, phonology, glosses, stressMask = self.formTable[4 * k:4 * k + 4]
+            forms.append(Form(self.string(orthography), self.morphemes(phonology), self.morphemes(glosses), frozenset([j for j in range(32) if stressMask >> j & 1])))
+
+        return Verb(tuple(forms), self.string(glossString), self.string(stressInfo), self.string(translation), bool(causative))
+
+#Return the hash of a corpus file's contents, so that results saved
+#by an earlier run can be checked against the corpus they came from
+def getCorpusHash(path):
+
+    h = hashlib.sha256()
+
+    with open(path, mode = "rb") as f:
+
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+
+            h.update(chunk)
+
+    return h.hexdigest()
+
+#Read in the corpus, from either format. A text corpus is returned as
+#a list of Verbs, and a binary one as a BinaryCorpus.
+def loadCorpus(path):
+
+    with open(path, mode = "rb") as f:
+
+        binary = f.read(4) == magic[:4]
+
+    if binary:
+
+        return BinaryCorpus(path)
+
+    with open(path, encoding = "utf-8") as f:
+
+        return [parseVerb(line) for line in f.read().split("\n") if line]
+
+if __name__ == "__main__":
+
+    textPath = sys.argv[1] if len(sys.argv) > 1 else "Corpus.txt"
+    binaryPath = sys.argv[2] if len(sys.argv) > 2 else "Corpus.bin"
+
+    verbs = loadCorpus(textPath)
+    writeBinary(verbs, binaryPath)
+
+    print(f"{len(verbs)} verbs written to {binaryPath}")
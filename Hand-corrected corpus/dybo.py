@@ -0,0 +1,584 @@
+#This module contains the functions for evaluating Dybo's Rule
+#against the corpus, used by Evaluating Dybo's Rule (October 2023).py:
+#breaking roots and preverbs up into elements, applying Dybo's Rule
+#to a list of accents, scoring a verb's seven forms, and finding the
+#best accents for a verb's root and preverb. Everything about a verb
+#that doesn't depend on the accents of its root and preverb is
+#worked out once by compileVerb, so trying out a combination of
+#accents only means filling them in.
+from collections import namedtuple
+
+from corpus import loadCorpus
+
+#I closely follow Spruit (1986), who claims that there is
+#one accent per element. For the functional morphemes
+#in my corpus, they are all monoelemental, but roots
+#and preverbs may have multiple elements. An element
+#is a sequence CV(V), or a C (if not immediately
+#followed by a vowel), or a V (if not immediately
+#preceded by a consonant).
+#I begin with the implementation of the following system
+#for underlying accents, a simplification of Spruit's (1986)
+#proposal without accentual allomorphy:
+#C1 = unaccented, C2 = accented, C3 = unaccented (but на is
+#accented), DEF = accented, INF = accented, NEG = unaccented,
+#DYN is accented, DYN.IMP is unaccented, ABS is accented,
+#NEG.ABS is unaccented, DYN.FIN is unaccented
+#The code contains several sections which can be left in or
+#commented out for implementing other variations of Abkhaz
+#stress assignment.
+
+accentStatus = {}
+
+#Specify the accent of each functional morpheme
+#A = accented, U = unaccented
+accentStatus["DEF"] = "A"
+accentStatus["INF"] = "A"
+
+accentStatus["C1"] = "U"
+accentStatus["C2"] = "A"
+accentStatus["C3"] = "U"
+accentStatus["NEG"] = "U"
+
+accentStatus["DYN"] = "A"
+accentStatus["DYN.FIN"] = "U"
+accentStatus["DYN.IMP"] = "U"
+accentStatus["ABS"] = "A"
+accentStatus["NEG.ABS"] = "U"
+
+#This function takes a phonological string (e.g. A-CaaCa-Ca)
+#and a corresponding gloss string (e.g. DEF-R-INF), and a
+#morpheme that appears in the gloss (e.g. R), and returns
+#a phonological string and gloss string where the morpheme
+#m has been divided into elements: [A-Caa-Ca-Ca, DEF-R0-R1-INF]
+def parseElements(phonString, glossString, m, causative):
+
+    #Get the phonological shape of m (e.g. CaaCa)
+    phonList = phonString.split("-")
+    glossList = glossString.split("-")
+    phonMorpheme = phonList[glossList.index(m)]
+
+    #Remove information about vowel quality (irrelevant)
+    phonMorpheme = phonMorpheme.replace("A", "V")
+    phonMorpheme = phonMorpheme.replace("Y", "V")
+    phonMorpheme = phonMorpheme.replace("a", "v")
+    phonMorpheme = phonMorpheme.replace("y", "v")
+
+    #Add hyphens corresponding to element boundaries
+
+##    #Edge case to deal with the causative prefix:
+##    #it's always the first segment of the "root"
+##    if causative and m == "R":
+##
+##        #Edge case for stressed causative prefix CY
+##        if phonMorpheme.startswith("CY"):
+##
+##            phonMorpheme = phonMorpheme[:2] + "-" + phonMorpheme[2:]
+##
+##        #Non-edge case: causative is just C
+##        else:
+##
+##            phonMorpheme = phonMorpheme[0] + "-" + phonMorpheme[1:]
+
+    #Postvocalic boundary
+    phonMorpheme = phonMorpheme.replace("V", "V-")    
+    phonMorpheme = phonMorpheme.replace("v", "v-")
+
+    #Add boundaries in consonant clusters
+    while "CC" in phonMorpheme:
+
+        phonMorpheme = phonMorpheme.replace("CC", "C-C")
+
+    #Remove redundant boundaries
+    while "--" in phonMorpheme:    
+
+        phonMorpheme = phonMorpheme.replace("--", "-")
+
+    #Treat vv as a single element (following Spruit 1986)
+    #*Stressed* long vowels don't occur in the corpus,
+    #so we can limit ourselves to lowercase v here
+    phonMorpheme = phonMorpheme.replace("v-v", "vv")
+
+    #Get rid of element boundary after final vowel
+    if phonMorpheme.endswith("v-") or phonMorpheme.endswith("V-"):
+
+        phonMorpheme = phonMorpheme[:-1]
+
+    #Update phonList with the newly parsed form
+    phonList[glossList.index(m)] = phonMorpheme
+
+    #Add corresponding hyphens to the gloss
+    newMorphemeGloss = ""
+
+    #The number of root elements is the number of hyphens
+    #in phonMorpheme plus one    
+    for i in range(phonMorpheme.count("-") + 1):
+
+        newMorphemeGloss += m + str(i) + "-"
+
+    if newMorphemeGloss.endswith("-"):
+
+        newMorphemeGloss = newMorphemeGloss[:-1]
+
+    #Replace the old gloss with the new gloss
+    glossList[glossList.index(m)] = newMorphemeGloss
+
+    #Return new forms
+    return ["-".join(phonList), "-".join(glossList)]
+
+#This function takes in a gloss string(e.g. "DEF-R0-R1-R2-INF")
+#and returns the number of morphemes that start with m. For example,
+#for m = "R", this function returns 2. It counts the number of
+#elements that are in the morpheme m in glossString
+def countElements(glossString, m):
+
+    glossList = glossString.split("-")
+    counter = 0
+
+    for g in glossList:
+
+        if g.startswith(m):
+
+            counter += 1
+
+    return counter
+
+#This function takes a Verb (see corpus.py), and breaks up its
+#preverb (if it has one) and root into elements in each of the
+#seven forms, changing the verb in place. It returns the number of
+#elements in the preverb and root, and a description of the problem
+#if the number varies across the seven forms, since then the
+#preverb or root shows allomorphy that we can't account for.
+def prepareVerb(verb):
+
+    numPrevElements = []
+    numRootElements = []
+
+    #This code breaks up both root and preverb into elements in each of the 7 forms
+    for form in verb.forms:
+
+        tempPhonString = "-".join(form.phonology)
+        tempGlossString = "-".join(form.glosses)
+
+        if "PREV" in verb.glossString:
+
+            tempPhonString, tempGlossString = parseElements(tempPhonString, tempGlossString, "PREV", verb.causative)
+            numPrevElements.append(countElements(tempGlossString, "PREV"))
+
+        else:
+
+            numPrevElements.append(0)
+
+        tempPhonString, tempGlossString = parseElements(tempPhonString, tempGlossString, "R", verb.causative)
+        numRootElements.append(countElements(tempGlossString, "R"))
+
+        form.setMorphemes(tempPhonString, tempGlossString)
+
+    #Check for preverb allomorphy, then root allomorphy
+    if len(set(numPrevElements)) > 1:
+
+        return [0, 0, "PREVERB ALLOMORPHY"]
+
+    if len(set(numRootElements)) > 1:
+
+        return [0, 0, "ROOT ALLOMORPHY"]
+
+    return [numPrevElements[0], numRootElements[0], ""]
+
+#Read in the corpus, and prepare every verb that can be evaluated
+#(see prepareVerb). Returns a list of [verb, numPrev, numRoot].
+def loadVerbs(path):
+
+    verbs = []
+
+    for verb in loadCorpus(path):
+
+        numPrev, numRoot, problem = prepareVerb(verb)
+
+        if not problem:
+
+            verbs.append([verb, numPrev, numRoot])
+
+    return verbs
+
+#This function takes in a list of accents (e.g. ["A", "U", "A"])
+#and a corresponding list of glosses (e.g. ["DEF", "R0", "INF"]),
+#and applies Dybo's Rule to the form. It returns an integer: the
+#index of the element that Dybo's Rule predicts should carry
+#primary stress
+def applyDybo(accentList, glossList):
+
+    #If there is no accent, stress is root-final
+    if "A" not in accentList:
+
+        #Loop through the glossList backwards to quickly
+        #find the final element glossed as part of the root
+        for i in range(len(glossList) - 1, -1, -1):
+
+            #If this is part of the root
+            if glossList[i].startswith("R"):
+
+                #It's the final element of the root since we're
+                #looping backwards, so just return this index:
+                #stress is on the final element of the root
+                return i
+
+    #If there is at least one underlying accent, we apply Dybo's Rule
+    #proper, stressing the leftmost accent not immediately followed
+    #by an accent
+    else:
+
+        #Go through each accent from left to right
+        for i in range(len(accentList)):
+
+            #If this is the final accent, and we haven't
+            #assigned stress yet, this is the morpheme
+            #that should be stressed
+            if i == len(accentList) - 1:
+
+                return i
+
+            #For any non-final element
+            else:
+
+                #Assign stress here if it's an A followed by a U
+                if accentList[i] == "A" and accentList[i + 1] == "U":
+
+                    return i
+
+#This function takes a Verb, the index of one of its forms (see
+#formNames in corpus.py), and the gloss and phonology of a
+#functional morpheme in that form, and returns the accent of the morpheme, and whether it
+#is one of the special cases from Spruit (1986). The accents of
+#the other functional morphemes are looked up in status, which is
+#accentStatus unless we're trying out a different system.
+def functionalAccent(verb, formIndex, gloss, phon, status = accentStatus):
+
+    #Special code for C3 (н)а, which exceptionally is accented
+    #This code overgenerates, and treats C3 ҳа as A rather than U,
+    #I've left this error in at the moment since this morpheme doesn't
+    #occur in my data at all
+    if gloss == "C3" and phon in ["CA", "Ca", "A", "a"]:
+
+        return ["A", False]
+
+    #Make C3 accented in causatives (Spruit 1986: 71)
+    elif gloss == "C3" and verb.causative:
+
+        return ["A", True]
+
+    #The negative prefix (NEG, but not in the present negative,
+    #where it's the negative suffix) is accented in causatives
+    #(Spruit 1986: 72)
+    elif gloss == "NEG" and not formIndex == 2 and verb.causative:
+
+        return ["A", True]
+
+    #The negative prefix is accented for C1-C2-R roots
+    elif gloss == "NEG" and not formIndex == 2 and verb.glossString == "C1-C2-R":
+
+        return ["A", True]
+
+    #Use the dictionary status to look up the
+    #accent status of this morpheme if none of the above
+    #edge cases apply
+    else:
+
+        return [status[gloss], False]
+
+#This function takes a Verb and the glosses of one of its forms,
+#and returns True if the form gets pre-stress (stress
+#on the element before the root) when the root starts with an
+#unaccented element
+def canPreStress(verb, glosses):
+
+    #Pre-stress only happens in absolutive-only verbs without preverbs
+    if "PREV" in verb.glossString or "C2" in glosses or "C3" in glosses:
+
+        return False
+
+    #1) Single-element unaccented verb roots
+    #2) Non-accent-initial verbs with a causative
+    return countElements("-".join(glosses), "R") == 1 or verb.causative
+
+#Everything about one of a verb's forms that doesn't depend on
+#the accents of its root and preverb, worked out once per verb:
+#the original glosses, a list with the accent of every element,
+#where the accents of root and preverb elements are filled in
+#for each combination we try, the position of each of those
+#elements (preverb elements first, then root elements), which
+#elements are stressed in the data (a prediction is right if it
+#stresses any of them), the final and first
+#elements of the root, whether the form can get pre-stress, and
+#whether it uses one of the special cases in functionalAccent
+FormInfo = namedtuple("FormInfo", ["glosses", "accents", "variables", "stressIndices", "rootFinal", "rootInitial", "preStress", "special"])
+
+#A verb ready to be evaluated: a FormInfo for each of the seven
+#forms, the number of elements in the preverb and root, and
+#whether the verb is a causative
+VerbInfo = namedtuple("VerbInfo", ["forms", "numPrev", "numRoot", "causative"])
+
+#This function takes a Verb whose root and preverb have already
+#been broken up into elements (see prepareVerb), and the number
+#of elements in its preverb and root, and returns a VerbInfo. The
+#accents of functional morphemes come from status (see
+#functionalAccent).
+def compileVerb(verb, numPrev, numRoot, status = accentStatus):
+
+    forms = []
+
+    for formIndex in range(len(verb.forms)):
+
+        glosses = verb.forms[formIndex].glosses
+        phonology = verb.forms[formIndex].phonology
+        accents = []
+        variables = [None] * (numPrev + numRoot)
+        special = False
+
+        for j in range(len(glosses)):
+
+            #Root and preverb elements are left empty for now
+            if glosses[j].startswith("R"):
+
+                accents.append(None)
+                variables[numPrev + int(glosses[j][1:])] = j
+
+            elif glosses[j].startswith("PREV"):
+
+                accents.append(None)
+                variables[int(glosses[j][4:])] = j
+
+            #Functional morphemes have a fixed accent
+            else:
+
+                accent, isSpecial = functionalAccent(verb, formIndex, glosses[j], phonology[j], status)
+                accents.append(accent)
+                special = special or isSpecial
+
+        rootFinal = max([j for j in range(len(glosses)) if glosses[j].startswith("R")])
+
+        forms.append(FormInfo(glosses, accents, variables, verb.forms[formIndex].stressIndices, rootFinal, glosses.index("R0"), canPreStress(verb, glosses), special))
+
+    return VerbInfo(forms, numPrev, numRoot, verb.causative)
+
+#This function takes a FormInfo whose accents have been filled
+#in, and returns the index of the element that Dybo's Rule (with
+#pre-stress) predicts should carry primary stress, and whether the
+#form was accounted for by a special case ("A") rather than by the
+#core system ("C"). Other theories of stress assignment can be
+#evaluated in the same way (see theories.py).
+def dyboStress(form):
+
+    method = "A" if form.special else "C"
+
+    #Implement pre-stress
+    if form.preStress and form.accents[form.rootInitial] == "U":
+
+        return [form.rootInitial - 1, "A"]
+
+    #Elsewhere case: Dybo's Rule
+    return [applyDybo(form.accents, form.glosses), method]
+
+#This is the function to evaluate Dybo's Rule against a verb's 7
+#forms. It takes in a VerbInfo, and the accents of the preverb
+#and root elements, one after the other (e.g. ["U", "A", "A"] for
+#a verb with a one-element preverb and a two-element root), and
+#returns a list with 1 for each form whose stress was correctly
+#predicted and 0 for each one that wasn't, and a list saying
+#which forms were accounted for by a special case ("A") rather
+#than by the core system ("C"). Another theory can be evaluated
+#by passing a different function in place of dyboStress.
+def evaluateAccents(verb, accents, assignStress = dyboStress):
+
+    evaluation = []
+    methods = []
+
+    for form in verb.forms:
+
+        #Fill in the accents of the root and preverb
+        for k in range(len(accents)):
+
+            form.accents[form.variables[k]] = accents[k]
+
+        #Find out which element is predicted to be stressed
+        stressIndex, method = assignStress(form)
+
+        #Now we have a prediction, and we want to check if it matches
+        #the data. Is the predicted element a stressed one? (Like
+        #a list index, -1 means the final element.)
+        if stressIndex % len(form.accents) in form.stressIndices:
+
+            #If yes, add 1 for a correct prediction
+            evaluation.append(1)
+
+        else:
+
+            #If no, add 0 for an incorrect prediction
+            evaluation.append(0)
+
+        methods.append(method)
+
+    return [evaluation, methods]
+
+#This function does the same as evaluateAccents, but takes in a
+#Verb that has been through prepareVerb, a list of accents
+#for each element in the root, and an optional list of accents for
+#each element in the preverb
+def evaluateDybo(v, rAccent, pAccent = []):
+
+    return evaluateAccents(compileVerb(v, len(pAccent), len(rAccent)), list(pAccent) + list(rAccent))
+
+#While we go through a form from left to right, all Dybo's Rule
+#needs to remember is the accent of the previous element and
+#whether we've seen an accent yet, as (previous, seen). Once we
+#get to an accented element followed by an unaccented one, the
+#stress is decided, and we just remember whether it was right,
+#as (True,) or (False,). This function takes one of those states
+#and the next element, and returns the new state.
+def stepForm(state, accent, j, form):
+
+    if len(state) == 1:
+
+        return state
+
+    if state[0] == "A" and accent == "U":
+
+        return (j - 1 in form.stressIndices,)
+
+    return (accent, state[1] or accent == "A")
+
+#Go through the elements of a form from start to end (not
+#including end), all of which are functional morphemes
+def runForm(state, form, start, end):
+
+    for j in range(start, end):
+
+        state = stepForm(state, form.accents[j], j, form)
+
+    return state
+
+#Once we get to the end of a form, return whether the stress was
+#predicted correctly: if it hasn't been decided yet, stress is on
+#the final element if there was an accent, and root-final if not
+def finishForm(state, form):
+
+    if len(state) == 1:
+
+        return state[0]
+
+    if state[1]:
+
+        return len(form.accents) - 1 in form.stressIndices
+
+    return form.rootFinal in form.stressIndices
+
+#This function takes a VerbInfo, and returns the accents of the
+#preverb and root that predict the stress of the most forms
+#correctly, as [pAccent, rAccent]. It gives the same answer as
+#trying every combination of accents with evaluateAccents, in the
+#order itertools.product would (U before A, preverb first), and
+#keeping the first best one. But rather than scoring every
+#combination, we go through the preverb and root elements from
+#left to right, and keep track of the state of each of the seven
+#forms (see stepForm). Two combinations that lead to the same
+#states will get the same score whatever comes next, so we only
+#keep the first one, which means the number of combinations we
+#keep never grows beyond the number of states. This relies on the
+#preverb and root elements coming in the same order in every form.
+#Causatives copy the accent of the following root element (Spruit
+#1986: 70), so for them, R0 and R1 only ever get the same accent.
+def solveAccents(verb):
+
+    forms = verb.forms
+    numPrev = verb.numPrev
+    numVariables = verb.numPrev + verb.numRoot
+
+    #Every form starts with no previous element, and goes up to
+    #its first variable
+    states = {tuple([runForm(("", False), form, 0, form.variables[0]) for form in forms]): ()}
+
+    for k in range(numVariables):
+
+        newStates = {}
+
+        for formStates, accents in states.items():
+
+            for accent in ["U", "A"]:
+
+                if verb.causative and k == numPrev + 1 and not accent == accents[numPrev]:
+
+                    continue
+
+                newFormStates = []
+
+                for form, state in zip(forms, formStates):
+
+                    j = form.variables[k]
+                    state = stepForm(state, accent, j, form)
+
+                    #Pre-stress overrides Dybo's Rule (see evaluateAccents)
+                    if k == numPrev and accent == "U" and form.preStress:
+
+                        state = ((form.rootInitial - 1) % len(form.accents) in form.stressIndices,)
+
+                    #Carry on up to the next variable
+                    if k + 1 < numVariables:
+
+                        state = runForm(state, form, j + 1, form.variables[k + 1])
+
+                    else:
+
+                        state = runForm(state, form, j + 1, len(form.accents))
+
+                    newFormStates.append(state)
+
+                newFormStates = tuple(newFormStates)
+
+                #Combinations are tried in order, so the first one
+                #to get to some states is the one we want to keep
+                if newFormStates not in newStates:
+
+                    newStates[newFormStates] = accents + (accent,)
+
+        states = newStates
+
+    bestScore = -1
+    bestAccents = ()
+
+    for formStates, accents in states.items():
+
+        score = [finishForm(state, form) for form, state in zip(forms, formStates)].count(True)
+
+        if score > bestScore:
+
+            bestScore = score
+            bestAccents = accents
+
+    return [bestAccents[:numPrev], bestAccents[numPrev:]]
+
+#This function takes a Verb straight from the corpus (it is changed
+#by prepareVerb), and evaluates Dybo's Rule on it with the best
+#accents for its preverb and root. It returns a dictionary that can
+#be saved as JSON, with the verb's masdar, gloss string and
+#translation, and either the reason it couldn't be evaluated, or
+#whether each form was predicted correctly (1 or 0), the accents,
+#and how each form's stress was assigned (see dyboStress)
+def evaluateVerb(verb, status = accentStatus):
+
+    numPrev, numRoot, problem = prepareVerb(verb)
+    record = {"verb": verb.name(), "glossString": verb.glossString, "translation": verb.translation, "problem": problem}
+
+    if problem:
+
+        return record
+
+    compiledVerb = compileVerb(verb, numPrev, numRoot, status)
+    prevAccent, rootAccent = solveAccents(compiledVerb)
+    score, methods = evaluateAccents(compiledVerb, prevAccent + rootAccent)
+
+    record["score"] = score
+    record["prevAccent"] = list(prevAccent)
+    record["rootAccent"] = list(rootAccent)
+    record["methods"] = methods
+
+    return record
@@ -0,0 +1,169 @@
+#This module answers questions about the corpus like "which
+#C1-C2-PREV-R verbs are causatives with stress on NEG in the present
+#negative?" without looping over the whole corpus each time. The
+#corpus is read in once, and an index is built for each kind of
+#question: for each value, the set of verbs that have it. A query
+#is then just the intersection of a few sets. Verbs can be looked
+#up by:
+#- template: the gloss string of their category (e.g. C1-C2-PREV-R)
+#- causative: True or False
+#- root: the phonological shape of the root in the masdar, without
+#  stress (e.g. CaaCa)
+#- stress: the gloss of the stressed morpheme in one of the seven
+#  forms (e.g. NEG in the present negative)
+#- words: words in the translation (e.g. "swing")
+#Run it with, e.g.:
+#python query.py template=C1-C2-PREV-R causative=Y "present negative=NEG" word=go
+import re
+import sys
+
+from corpus import formNames, loadCorpus
+
+corpusFile = "Corpus.txt"
+
+#Stressed vowels, and what they are without stress
+unstressed = str.maketrans("AYVGE", "ayvge")
+
+#The placeholders for a verb's arguments in its translation, which
+#aren't worth indexing
+argumentMarkers = ["C1", "C2", "C3"]
+
+#This function takes a Verb, and returns the phonological shape of
+#its root in the masdar, without stress, or "" if the root isn't
+#one morpheme there
+def getRoot(verb):
+
+    masdar = verb.forms[0]
+
+    if masdar.glosses.count("R") == 1:
+
+        return masdar.phonology[masdar.glosses.index("R")].translate(unstressed)
+
+    return ""
+
+#This function takes a Verb, and returns the words in its
+#translation, in lower case
+def getWords(verb):
+
+    return {word.lower() for word in re.findall(r"\w+", verb.translation) if word not in argumentMarkers}
+
+class VerbIndex:
+
+    #Build every index from a list of Verbs. Each index is a
+    #dictionary from a value to the set of the positions of the
+    #verbs with that value in the list.
+    def __init__(self, verbs):
+
+        self.verbs = verbs
+        self.everything = frozenset(range(len(verbs)))
+        self.templates = {}
+        self.causatives = {}
+        self.roots = {}
+        self.stresses = {}
+        self.words = {}
+
+        for i in range(len(verbs)):
+
+            verb = verbs[i]
+
+            self.templates.setdefault(verb.glossString, set()).add(i)
+            self.causatives.setdefault(verb.causative, set()).add(i)
+            self.roots.setdefault(getRoot(verb), set()).add(i)
+
+            for j in range(len(verb.forms)):
+
+                form = verb.forms[j]
+
+                for k in form.stressIndices:
+
+                    self.stresses.setdefault((formNames[j], form.glosses[k]), set()).add(i)
+
+            for word in getWords(verb):
+
+                self.words.setdefault(word, set()).add(i)
+
+    #Return the positions of the verbs matching every condition given,
+    #in order. stress is a dictionary from the name of a form (see
+    #formNames in corpus.py) to the gloss of its stressed morpheme,
+    #and words is a list of words that must all be in the
+    #translation. Conditions that are None (or empty) are ignored.
+    def find(self, template = None, causative = None, root = None, stress = {}, words = []):
+
+        matches = []
+
+        if template is not None:
+
+            matches.append(self.templates.get(template, set()))
+
+        if causative is not None:
+
+            matches.append(self.causatives.get(causative, set()))
+
+        if root is not None:
+
+            matches.append(self.roots.get(root.translate(unstressed), set()))
+
+        for formName, gloss in stress.items():
+
+            matches.append(self.stresses.get((formName, gloss), set()))
+
+        for word in words:
+
+            matches.append(self.words.get(word.lower(), set()))
+
+        if not matches:
+
+            return sorted(self.everything)
+
+        #Start from the smallest set, so there's as little as possible
+        #to intersect
+        matches.sort(key = len)
+
+        return sorted(matches[0].intersection(*matches[1:]))
+
+    #The same as find, but returns the Verbs themselves
+    def query(self, template = None, causative = None, root = None, stress = {}, words = []):
+
+        return [self.verbs[i] for i in self.find(template, causative, root, stress, words)]
+
+#Build an index of a corpus file (text or binary, see corpus.py)
+def loadIndex(path = corpusFile):
+
+    return VerbIndex(loadCorpus(path))
+
+if __name__ == "__main__":
+
+    conditions = {"stress": {}, "words": []}
+
+    for arg in sys.argv[1:]:
+
+        key, value = arg.split("=", 1)
+
+        if key == "template":
+
+            conditions["template"] = value
+
+        elif key == "causative":
+
+            conditions["causative"] = value == "Y"
+
+        elif key == "root":
+
+            conditions["root"] = value
+
+        elif key == "word":
+
+            conditions["words"].append(value)
+
+        elif key in formNames:
+
+            conditions["stress"][key] = value
+
+        else:
+
+            print(f"Unknown condition: {key}")
+            sys.exit(1)
+
+    for verb in loadIndex().query(**conditions):
+
+        print(f"{verb.name()}\t{verb.glossString}\t{verb.translation}")
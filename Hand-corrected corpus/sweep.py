@@ -0,0 +1,181 @@
+#This script evaluates Dybo's Rule against the corpus for many
+#different systems of functional morpheme accents at once, instead
+#of only the one in accentStatus in dybo.py. By default it tries
+#all 2^11 ways of making each functional morpheme accented or
+#unaccented. If some morphemes are given on the command line, only
+#their accents are varied, and the rest keep the accent they have
+#in accentStatus. Run it with:
+#python sweep.py [--workers N] [--corpus PATH] [MORPHEME ...]
+#The corpus can be Corpus.txt or a binary corpus (see corpus.py).
+#Either way, it's read in and prepared once (see prepareVerb in
+#dybo.py), and the prepared verbs are written to a temporary binary
+#corpus, which the workers read from.
+#Each system is evaluated on its own process, and the result is
+#written to a file as soon as it's done. If the script is stopped
+#and run again, the systems already in the file are skipped. The
+#file starts with a hash of the corpus, and the script won't carry
+#on with results from a different corpus.
+import os
+import sys
+import tempfile
+from itertools import product
+from concurrent.futures import ProcessPoolExecutor
+
+from corpus import BinaryCorpus, writeBinary, getCorpusHash
+from dybo import accentStatus, loadVerbs, compileVerb, evaluateAccents, solveAccents
+
+corpusFile = "Corpus.txt"
+resultsFile = "Sweep results.txt"
+
+#The functional morphemes whose accents we vary, in the order
+#they're written in a system: e.g. "AAUAUUAUUAU" means DEF = A,
+#INF = A, C1 = U, and so on
+morphemes = ["DEF", "INF", "C1", "C2", "C3", "NEG", "DYN", "DYN.FIN", "DYN.IMP", "ABS", "NEG.ABS"]
+
+#This function takes a system written as a string, and returns
+#it as a dictionary like accentStatus
+def getStatus(system):
+
+    return dict(zip(morphemes, system))
+
+#This function takes a list of morphemes to vary, and returns
+#every system where only those morphemes differ from accentStatus
+def getSystems(varied):
+
+    systems = []
+
+    for accents in product(["U", "A"], repeat = len(varied)):
+
+        status = dict(accentStatus)
+        status.update(zip(varied, accents))
+        systems.append("".join([status[m] for m in morphemes]))
+
+    return systems
+
+#Each worker opens the prepared corpus once, when it starts, and
+#gets the number of preverb and root elements of each verb in it.
+#Verbs are made from the file as they're needed (see BinaryCorpus in
+#corpus.py) and compileVerb doesn't change them, so a worker doesn't
+#keep a copy of the corpus of its own.
+workerCorpus = []
+workerSizes = []
+
+def setVerbs(path, sizes):
+
+    global workerCorpus, workerSizes
+    workerCorpus = BinaryCorpus(path)
+    workerSizes = sizes
+
+#This function takes a system, and returns the system, the total
+#number of forms predicted correctly, and the number of verbs with
+#all seven forms predicted correctly, using the best root and
+#preverb accents for each verb
+def evaluateSystem(system):
+
+    status = getStatus(system)
+    totalCorrect = 0
+    verbsCorrect = 0
+
+    for n in range(len(workerSizes)):
+
+        numPrev, numRoot = workerSizes[n]
+        compiledVerb = compileVerb(workerCorpus[n], numPrev, numRoot, status)
+        prevAccent, rootAccent = solveAccents(compiledVerb)
+        score = evaluateAccents(compiledVerb, prevAccent + rootAccent)[0].count(1)
+
+        totalCorrect += score
+
+        if score == 7:
+
+            verbsCorrect += 1
+
+    return [system, totalCorrect, verbsCorrect]
+
+#Read in the results of earlier runs. Returns the hash of the corpus
+#they were evaluated on (or None if there isn't one), and a
+#dictionary from each system to [totalCorrect, verbsCorrect].
+def loadResults(path):
+
+    corpusHash = None
+    results = {}
+
+    try:
+
+        with open(path, encoding = "utf-8") as f:
+
+            for line in f.read().split("\n"):
+
+                if line.startswith("corpus\t"):
+
+                    corpusHash = line.split("\t")[1]
+
+                elif line:
+
+                    system, totalCorrect, verbsCorrect = line.split("\t")
+                    results[system] = [int(totalCorrect), int(verbsCorrect)]
+
+    except FileNotFoundError:
+
+        pass
+
+    return [corpusHash, results]
+
+if __name__ == "__main__":
+
+    workers = None
+
+    if "--workers" in sys.argv:
+
+        workers = int(sys.argv[sys.argv.index("--workers") + 1])
+
+    if "--corpus" in sys.argv:
+
+        corpusFile = sys.argv[sys.argv.index("--corpus") + 1]
+
+    varied = [m for m in sys.argv[1:] if m in morphemes] or morphemes
+    systems = getSystems(varied)
+    corpusHash = getCorpusHash(corpusFile)
+    savedHash, results = loadResults(resultsFile)
+
+    if (savedHash or results) and not savedHash == corpusHash:
+
+        print(f"{resultsFile} has results from a different corpus: move or delete it to start again")
+        sys.exit(1)
+
+    todo = [system for system in systems if system not in results]
+    verbs = loadVerbs(corpusFile)
+    folder = tempfile.TemporaryDirectory()
+    preparedFile = os.path.join(folder.name, "Prepared.bin")
+
+    writeBinary([verb for verb, numPrev, numRoot in verbs], preparedFile)
+
+    print(f"{len(systems)} systems, {len(systems) - len(todo)} already evaluated")
+
+    with folder, ProcessPoolExecutor(workers, initializer = setVerbs, initargs = (preparedFile, [(numPrev, numRoot) for verb, numPrev, numRoot in verbs])) as pool:
+
+        with open(resultsFile, encoding = "utf-8", mode = "a") as f:
+
+            if savedHash is None:
+
+                f.write(f"corpus\t{corpusHash}\n")
+
+            for done, (system, totalCorrect, verbsCorrect) in enumerate(pool.map(evaluateSystem, todo, chunksize = 4), 1):
+
+                results[system] = [totalCorrect, verbsCorrect]
+
+                #Write each result as soon as we have it, so that
+                #nothing is lost if the script is stopped
+                f.write(f"{system}\t{totalCorrect}\t{verbsCorrect}\n")
+                f.flush()
+
+                print(f"{done}/{len(todo)} systems evaluated", end = "\r")
+
+    print()
+
+    #Show the ten best systems out of the ones we tried
+    best = sorted(systems, key = lambda system: results[system], reverse = True)
+
+    for system in best[:10]:
+
+        accents = " ".join([m + "=" + a for m, a in zip(morphemes, system)])
+        print(f"{accents}: {results[system][0]}/{7 * len(verbs)} forms, {results[system][1]}/{len(verbs)} verbs")
@@ -0,0 +1,142 @@
+#This module contains a registry of theories of stress assignment,
+#which can all be evaluated against the corpus in one pass: every
+#verb is read in and broken up into elements once, and then each
+#theory is tried on it. Run it with:
+#python theories.py [THEORY ...]
+#to print a table comparing the theories given (or all of them).
+#A theory is a function that takes a FormInfo (see dybo.py) whose
+#accents have been filled in, and returns the index of the element
+#it predicts should be stressed, and "A" or "C" (see dyboStress).
+import sys
+from itertools import product
+from collections import namedtuple
+
+from dybo import loadVerbs, compileVerb, evaluateAccents, dyboStress, solveAccents
+
+corpusFile = "Corpus.txt"
+
+#A theory: its name, the function that assigns stress, and the
+#function that finds the best accents for a verb's root and preverb
+#under this theory, if there's a quicker way than trying them all
+StressRule = namedtuple("StressRule", ["name", "assignStress", "findAccents"])
+
+stressRules = {}
+
+#This function adds a theory to the registry
+def addStressRule(name, assignStress, findAccents = None):
+
+    stressRules[name] = StressRule(name, assignStress, findAccents)
+
+#This function takes a VerbInfo and a function that assigns stress,
+#and tries every combination of accents for the root and preverb,
+#returning the first one that predicts the most forms correctly, as
+#[pAccent, rAccent]
+def searchAccents(verb, assignStress):
+
+    bestScore = -1
+    bestAccents = ()
+
+    for accents in product(["U", "A"], repeat = verb.numPrev + verb.numRoot):
+
+        #Edge case for causatives: they copy the accent of the following
+        #root element (Spruit 1986: 70)
+        if verb.causative and not accents[verb.numPrev] == accents[verb.numPrev + 1]:
+
+            continue
+
+        score = evaluateAccents(verb, accents, assignStress)[0].count(1)
+
+        if score > bestScore:
+
+            bestScore = score
+            bestAccents = accents
+
+        #We're never going to beat accounting for all 7 forms
+        if bestScore == 7:
+
+            break
+
+    return [bestAccents[:verb.numPrev], bestAccents[verb.numPrev:]]
+
+#For theories that ignore accents, any accents will do
+def noAccents(verb):
+
+    return [("U",) * verb.numPrev, ("U",) * verb.numRoot]
+
+#This function takes a VerbInfo and a theory, and returns the best
+#accents for the verb's root and preverb under that theory
+def findAccents(verb, rule):
+
+    if rule.findAccents is None:
+
+        return searchAccents(verb, rule.assignStress)
+
+    return rule.findAccents(verb)
+
+#Consistent initial stress
+def initialStress(form):
+
+    return [0, "C"]
+
+#Consistent final stress
+def finalStress(form):
+
+    return [len(form.accents) - 1, "C"]
+
+#Consistent root-initial stress
+def rootInitialStress(form):
+
+    return [form.rootInitial, "C"]
+
+#Consistent root-final stress
+def rootFinalStress(form):
+
+    return [form.rootFinal, "C"]
+
+addStressRule("Dybo", dyboStress, solveAccents)
+addStressRule("initial", initialStress, noAccents)
+addStressRule("final", finalStress, noAccents)
+addStressRule("root-initial", rootInitialStress, noAccents)
+addStressRule("root-final", rootFinalStress, noAccents)
+
+#This function takes the output of loadVerbs and a list of
+#theories, and returns, for each theory, the total number of forms
+#predicted correctly and the number of verbs with all seven forms
+#predicted correctly, as a dictionary from the theory's name
+def compareRules(verbs, rules):
+
+    results = {rule.name: [0, 0] for rule in rules}
+
+    for verb, numPrev, numRoot in verbs:
+
+        #Every theory shares the same compiled verb
+        compiledVerb = compileVerb(verb, numPrev, numRoot)
+
+        for rule in rules:
+
+            prevAccent, rootAccent = findAccents(compiledVerb, rule)
+            score = evaluateAccents(compiledVerb, prevAccent + rootAccent, rule.assignStress)[0].count(1)
+
+            results[rule.name][0] += score
+
+            if score == 7:
+
+                results[rule.name][1] += 1
+
+    return results
+
+if __name__ == "__main__":
+
+    rules = [stressRules[name] for name in sys.argv[1:] if name in stressRules] or list(stressRules.values())
+    verbs = loadVerbs(corpusFile)
+    results = compareRules(verbs, rules)
+
+    print(f"{'Theory':<15}{'Forms correct':<25}{'Verbs 7/7 correct':<25}")
+
+    for rule in rules:
+
+        totalCorrect, verbsCorrect = results[rule.name]
+        forms = f"{totalCorrect}/{7 * len(verbs)} ({100 * totalCorrect / (7 * len(verbs)):.1f}%)"
+        verbCount = f"{verbsCorrect}/{len(verbs)} ({100 * verbsCorrect / len(verbs):.1f}%)"
+
+        print(f"{rule.name:<15}{forms:<25}{verbCount:<25}")
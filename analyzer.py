@@ -0,0 +1,320 @@
+#This module segments and glosses a single verb form, on its own,
+#rather than a whole row of seven forms like 5. Fix morpheme
+#boundaries.py. Every form in every verb category (see paradigms.py)
+#is a sequence of slots, e.g. C1-NEG-R-DYN.IMP. We know which
+#morphemes can go in each slot: the affixes in generate.py, and the
+#person markers, preverbs and roots found in a corpus that's already
+#been parsed. All of this is compiled into one finite-state machine,
+#which reads a form one character at a time, keeping track of every
+#slot and every morpheme it could be in the middle of. Each set of
+#possibilities it can be in is worked out once and remembered, so
+#after a warm-up, reading a form takes time linear in its length,
+#however big the lexicon is. The path it took is then traced back
+#to find where the boundaries are.
+#Forms can be given with or without hyphens and stress. Run it with:
+#python analyzer.py [--lexicon PATH] FORM ...
+#or give forms on standard input, one or more per line.
+import os
+import sys
+from collections import namedtuple
+
+from paradigms import templates
+from generate import affixes, coalesce
+
+#A parsed corpus whose morphemes are used as the lexicon. Only the
+#orthography and gloss columns are used, so this can be the output
+#of 6. Parse forms.py too.
+lexiconFile = os.path.join("Hand-corrected corpus", "Corpus.txt")
+
+#The names of the seven forms, in the order they come in a row
+formNames = ["masdar", "present affirmative", "present negative", "imperative affirmative", "imperative negative", "absolutive affirmative", "absolutive negative"]
+
+#Variants of affixes that aren't in generate.py
+extraAffixes = [("DYN", "уе"), ("DYN", "уа"), ("NEG", "мы")]
+
+#One way of analysing a form: its morphemes, their glosses, and
+#every verb category and form this could be, as (glossString,
+#formName)
+Analysis = namedtuple("Analysis", ["morphemes", "glosses", "categories"])
+
+#This function takes a form, and returns it without hyphens or
+#stress, which is what the machine reads
+def normalize(form):
+
+    return form.replace("-", "").replace("¡", "").lower()
+
+class Analyzer:
+
+    #This function takes rows like those in 6. Parsed forms.txt,
+    #and any other roots we should know about, and compiles the
+    #machine
+    def __init__(self, rows, roots = []):
+
+        #The morphemes that can go in each slot, and every prefix
+        #of them (so we know whether to keep reading a morpheme)
+        self.morphemes = {}
+        self.prefixes = {}
+
+        for gloss, m in list(affixes.items()) + extraAffixes:
+
+            self.addMorpheme(gloss, m)
+
+        for row in rows:
+
+            for i in range(0, 21, 3):
+
+                forms = row[i].split("-")
+                glosses = row[i + 2].split("-")
+
+                #Rows that were corrected by hand don't always line up
+                if len(forms) == len(glosses):
+
+                    for m, gloss in zip(forms, glosses):
+
+                        self.addMorpheme(gloss, m)
+
+        for root in roots:
+
+            self.addMorpheme("R", root)
+            self.addMorpheme("R.DYN", coalesce(root))
+
+        #The slots of every form of every category, stored as a trie
+        #so that forms which start the same way share positions.
+        #Position 0 is the start. Each position has the gloss of its
+        #slot, the position before it, the positions that can come
+        #after it, and the forms that can end there.
+        self.glosses = [None]
+        self.parents = [None]
+        self.following = [[]]
+        self.endings = [[]]
+
+        for template in templates.values():
+
+            for i in range(len(template.fullGlosses)):
+
+                self.addForm(template.fullGlosses[i], template.glossString, formNames[i])
+
+        #Hand-corrected rows can have glosses that aren't in any of
+        #the templates, so those are added too
+        for row in rows:
+
+            for i in range(0, 21, 3):
+
+                self.addForm(row[i + 2], row[21] if len(row) > 21 else "", formNames[i // 3])
+
+        #Sets of states we've seen, and where each one goes on each
+        #character (see step)
+        self.start = frozenset([(0, "")])
+        self.transitions = {}
+
+    def addMorpheme(self, gloss, m):
+
+        m = normalize(m)
+
+        if not m:
+
+            return
+
+        self.morphemes.setdefault(gloss, set()).add(m)
+
+        for i in range(1, len(m) + 1):
+
+            self.prefixes.setdefault(gloss, set()).add(m[:i])
+
+    #Add the slots of a form, given as its glosses (e.g. C1-R-ABS),
+    #and which category and form it is
+    def addForm(self, glosses, glossString, formName):
+
+        position = 0
+
+        for gloss in glosses.split("-"):
+
+            position = self.addPosition(position, gloss)
+
+        if (glossString, formName) not in self.endings[position]:
+
+            self.endings[position].append((glossString, formName))
+
+    #Return the position after position with a slot for gloss,
+    #adding it if there isn't one
+    def addPosition(self, position, gloss):
+
+        for nextPosition in self.following[position]:
+
+            if self.glosses[nextPosition] == gloss:
+
+                return nextPosition
+
+        self.glosses.append(gloss)
+        self.parents.append(position)
+        self.following.append([])
+        self.endings.append([])
+        self.following[position].append(len(self.glosses) - 1)
+
+        return len(self.glosses) - 1
+
+    #Whether we're at the end of a morpheme in a state
+    def isComplete(self, state):
+
+        position, m = state
+
+        return position == 0 or m in self.morphemes.get(self.glosses[position], ())
+
+    #A state is a position and how much of the morpheme in that slot
+    #we've read so far. This function returns the states we can be
+    #in after reading one more character: either the same morpheme
+    #goes on, or it ends and a morpheme in a following slot starts.
+    def stepState(self, state, ch):
+
+        position, m = state
+        states = []
+
+        if position > 0 and m + ch in self.prefixes.get(self.glosses[position], ()):
+
+            states.append((position, m + ch))
+
+        if self.isComplete(state):
+
+            for nextPosition in self.following[position]:
+
+                if ch in self.prefixes.get(self.glosses[nextPosition], ()):
+
+                    states.append((nextPosition, ch))
+
+        return states
+
+    #This function takes a set of states and a character, and returns
+    #the set of states after reading it. Each answer is remembered,
+    #so this only has to be worked out once for every set.
+    def step(self, states, ch):
+
+        transitions = self.transitions.setdefault(states, {})
+
+        if ch not in transitions:
+
+            transitions[ch] = frozenset([nextState for state in states for nextState in self.stepState(state, ch)])
+
+        return transitions[ch]
+
+    #This function takes a form, and returns a list of every Analysis
+    #of it, or an empty list if it can't be analysed
+    def analyze(self, form):
+
+        #Keep stress in the morphemes we give back, but not hyphens
+        characters = form.replace("-", "").replace("¡", "")
+        s = characters.lower()
+        history = [self.start]
+
+        for ch in s:
+
+            history.append(self.step(history[-1], ch))
+
+            if not history[-1]:
+
+                return []
+
+        analyses = []
+
+        for state in history[-1]:
+
+            if self.isComplete(state) and self.endings[state[0]]:
+
+                glosses = self.getGlosses(state[0])
+
+                for boundaries in self.traceBack(history, s, state):
+
+                    morphemes = [characters[boundaries[i]:boundaries[i + 1]] for i in range(len(boundaries) - 1)]
+                    analysis = Analysis(morphemes, glosses, self.endings[state[0]])
+
+                    if analysis not in analyses:
+
+                        analyses.append(analysis)
+
+        return analyses
+
+    #Return the glosses of the slots on the way to a position
+    def getGlosses(self, position):
+
+        glosses = []
+
+        while position > 0:
+
+            glosses.append(self.glosses[position])
+            position = self.parents[position]
+
+        return glosses[::-1]
+
+    #This function takes the sets of states after each character, the
+    #form, and a state we ended in, and returns the positions of the
+    #morpheme boundaries on every path that ends in that state (plus
+    #0 and the end of the form)
+    def traceBack(self, history, s, state):
+
+        paths = []
+        stack = [(len(s), state, [len(s)])]
+
+        while stack:
+
+            i, state, boundaries = stack.pop()
+
+            if i == 0:
+
+                paths.append([0] + boundaries[::-1])
+
+                continue
+
+            for previous in history[i - 1]:
+
+                if state in self.stepState(previous, s[i - 1]):
+
+                    #A new morpheme started if we're only one character
+                    #into this one
+                    if len(state[1]) == 1 and i - 1 > 0:
+
+                        stack.append((i - 1, previous, boundaries + [i - 1]))
+
+                    else:
+
+                        stack.append((i - 1, previous, boundaries))
+
+        return paths
+
+    #Analyse running text, and return a list of (word, analyses)
+    def analyzeText(self, text):
+
+        return [(word, self.analyze(word)) for word in text.split()]
+
+#Compile an Analyzer from a parsed corpus file
+def loadAnalyzer(path = lexiconFile, roots = []):
+
+    with open(path, encoding="utf-8") as f:
+
+        rows = [line.split("\t") for line in f.read().split("\n") if line]
+
+    return Analyzer(rows, roots)
+
+if __name__ == "__main__":
+
+    args = sys.argv[1:]
+
+    if "--lexicon" in args:
+
+        lexiconFile = args[args.index("--lexicon") + 1]
+        args.remove("--lexicon")
+        args.remove(lexiconFile)
+
+    analyzer = loadAnalyzer(lexiconFile)
+    words = args or sys.stdin.read().split()
+
+    for word in words:
+
+        analyses = analyzer.analyze(word)
+
+        if not analyses:
+
+            print(f"{word}\t?")
+
+        for analysis in analyses:
+
+            categories = ", ".join([f"{glossString} {formName}" for glossString, formName in analysis.categories])
+            print(f"{word}\t{'-'.join(analysis.morphemes)}\t{'-'.join(analysis.glosses)}\t{categories}")
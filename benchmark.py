@@ -0,0 +1,346 @@
+#This module times every stage of the corpus creation pipeline (see
+#pipeline.py) and of the Dybo's Rule evaluator (see Hand-corrected
+#corpus/dybo.py) on inputs of different sizes, so we can see how they
+#scale and whether a change made them faster.
+#The inputs are synthetic: a dictionary in the same format as Yanagisawa
+#(2010), with randomly made-up verbs from every verb category we
+#extract (plus some entries that should be thrown out along the way),
+#and a corpus made by repeating the hand-corrected corpus. At scale 1
+#the dictionary has dictionarySize verb entries and the corpus is the
+#size of the hand-corrected one; at scale 10 both are ten times that.
+#Each stage is run a few times and the fastest time is kept. It's
+#then run once more with tracemalloc, to find the most memory that
+#was in use during the stage (tracemalloc slows things down, so this
+#run isn't timed). The results are saved as JSON, and an earlier
+#results file can be given to compare against. Run it with:
+#python benchmark.py [--scales 1,10,100] [--repeat N] [--output PATH] [--compare PATH]
+import os
+import sys
+import json
+import time
+import random
+import platform
+import tempfile
+import tracemalloc
+
+import pipeline
+from extraction import allowedGlossStr
+
+#The evaluator lives with the hand-corrected corpus
+corpusFolder = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Hand-corrected corpus")
+sys.path.append(corpusFolder)
+
+from corpus import loadCorpus
+from dybo import prepareVerb, compileVerb, evaluateAccents, solveAccents
+
+#The number of verb entries in the synthetic dictionary at scale 1
+dictionarySize = 3000
+
+#The hand-corrected corpus, which synthetic corpora are made from
+corpusFile = os.path.join(corpusFolder, "Corpus.txt")
+
+outputFile = "benchmark.json"
+
+#Pieces that made-up verbs are built from, in the dictionary's
+#transcription (see dictIn in orthography.py)
+consonants = ["b", "d", "g", "k", "l", "m", "n", "p", "r", "s", "t", "x", "c", "z", "ӡ", "ç", "h", "k´", "c´", "x´", "ҟ"]
+vowels = ["a", "y"]
+preverbs = ["aa", "ta", "la", "ca", "k´a", "ay", "xa", "ӡy"]
+definitions = ["to see", "to go", "to bore", "to smoke", "to put on", "to take away", "to look at", "to swing"]
+
+#Return a made-up root of one to three syllables
+def makeRoot(rng):
+
+    syllables = [rng.choice(consonants) + rng.choice(vowels) for i in range(rng.choice([1, 1, 2, 2, 3]))]
+
+    #Some roots end in a consonant
+    if rng.random() < 0.3:
+
+        syllables.append(rng.choice(consonants))
+
+    return "".join(syllables)
+
+#This function takes the morphemes of a form, and returns it with
+#hyphens between morphemes and stress (¡) after one of its vowels
+def joinForm(morphemes, rng):
+
+    form = "-".join(morphemes)
+    positions = [i + 1 for i in range(len(form)) if form[i] in "aeiouy" and not form[i + 1:i + 2] == "a" and not form[i - 1:i + 1] == "aa"]
+
+    if not positions:
+
+        return form
+
+    i = rng.choice(positions)
+
+    return form[:i] + "¡" + form[i:]
+
+#This function takes a gloss string from the dictionary (see
+#allowedGlossStr in extraction.py), and returns the seven forms of a
+#made-up verb in that category, in the same order as the pipeline
+def makeForms(glossStr, rng):
+
+    root = makeRoot(rng)
+    prefixes = []
+    prevs = []
+
+    for gloss in glossStr.split("-"):
+
+        if gloss == "R":
+
+            continue
+
+        elif gloss == "Prev":
+
+            prevs.append(rng.choice(preverbs))
+            prefixes.append(prevs[-1])
+
+        else:
+
+            prefixes.append({"C1": "d", "C2": "y", "C3": "l"}[gloss])
+
+    #C3 isn't marked in the imperative affirmative or the absolutives
+    noC3 = [p for p, gloss in zip(prefixes, glossStr.split("-")[:-1]) if not gloss == "C3"]
+
+    #The root either coalesces with the dynamic marker or not
+    if rng.random() < 0.5:
+
+        presAff = prefixes + [root + "o", "yt"]
+        presNeg = prefixes + [root + "o", "m"]
+
+    else:
+
+        presAff = prefixes + [root, "ue", "yt"]
+        presNeg = prefixes + [root, "ua", "m"]
+
+    #The second person imperative has b- rather than d-
+    impPrefixes = ["b" if p == "d" else p for p in noC3]
+
+    forms = [
+        ["a"] + prevs + [root, "ra"],
+        presAff,
+        presNeg,
+        impPrefixes + [root],
+        ["by" if p == "d" else p for p in prefixes] + ["m", root, "n"],
+        noC3 + [root, "ny"],
+        noC3 + ["m", root, "k´a"]
+        ]
+
+    return [joinForm(form, rng) for form in forms]
+
+#This function takes a number of verb entries and a seed, and
+#returns the text of a synthetic dictionary. Some entries are in a
+#category we don't extract, some are missing forms, and some are
+#split across pages, like in the real dictionary.
+def makeDictionary(size, seed = 0):
+
+    rng = random.Random(seed)
+    entries = []
+    page = 1
+
+    for i in range(size):
+
+        glossStr = rng.choice(allowedGlossStr + ["C1-C3-C2-R", "C1-(C2)-C3-R", "Prev-C1-R"])
+        tag = rng.choice(["[tr.", "[intr.", "[tr. (1)"]) + rng.choice(["]", " dynamic]", " stative]"])
+        masdar, presAff, presNeg, impAff, impNeg, absAff, absNeg = makeForms(glossStr.replace("(C2)", "C2"), rng)
+        separator = rng.choice([" / ", " / ", " # ", " #\n", "\n/ "])
+        definition = rng.choice(definitions)
+
+        if rng.random() < 0.05:
+
+            absNeg = ""
+
+        entries.append(f"{masdar}{rng.choice(['', '1'])} {tag} [{glossStr}]\n[pres.] {presAff}{separator}{presNeg},\nd-x [imper.] {impAff} / {impNeg} Abs. {absAff} / {absNeg} 1. {definition}\n")
+
+        if rng.random() < 0.2:
+
+            entries.append(f"\n- {page} -\n")
+            page = page % 589 + 1
+
+    return "".join(entries)
+
+#This function takes a scale, and returns the text of a corpus with
+#scale copies of every verb in the hand-corrected corpus
+def makeCorpus(scale):
+
+    with open(corpusFile, encoding="utf-8") as f:
+
+        lines = [line for line in f.read().split("\n") if line]
+
+    return "\n".join(lines * scale)
+
+#The evaluator, split into stages like the pipeline: reading in the
+#corpus, breaking up each verb into elements and compiling it, and
+#finding the best accents for each verb and scoring them
+def loadStage(path):
+
+    return loadCorpus(path)
+
+def compileStage(verbs):
+
+    compiledVerbs = []
+
+    for verb in verbs:
+
+        numPrev, numRoot, problem = prepareVerb(verb)
+
+        if not problem:
+
+            compiledVerbs.append(compileVerb(verb, numPrev, numRoot))
+
+    return compiledVerbs
+
+def solveStage(compiledVerbs):
+
+    scores = []
+
+    for verb in compiledVerbs:
+
+        prevAccent, rootAccent = solveAccents(verb)
+        scores.append(evaluateAccents(verb, prevAccent + rootAccent)[0].count(1))
+
+    return scores
+
+#The stages of each benchmark, as [name, function]. Each stage takes
+#the output of the one before; the first one takes a path.
+benchmarks = {
+    "pipeline": [[checkpoint[:-len(".txt")], stage] for checkpoint, stage in [s[:2] for s in pipeline.stages]],
+    "evaluator": [["load corpus", loadStage], ["compile verbs", compileStage], ["solve accents", solveStage]]
+    }
+
+#This function takes a list of stages and the path to the first
+#stage's input, and runs every stage in order, returning a list with
+#how long each one took, and how many rows it returned. If traced is
+#True, the most memory in use during each stage is returned instead
+#of the time.
+def runStages(stages, path, traced = False):
+
+    results = []
+    rows = path
+
+    if traced:
+
+        tracemalloc.start()
+
+    for name, stage in stages:
+
+        if traced:
+
+            tracemalloc.reset_peak()
+
+        start = time.perf_counter()
+        rows = stage(rows)
+        end = time.perf_counter()
+
+        results.append(tracemalloc.get_traced_memory()[1] if traced else end - start)
+
+    if traced:
+
+        tracemalloc.stop()
+
+    return [results, len(rows)]
+
+#This function takes the name of a benchmark, the path to its input,
+#and how many times to time it, and returns a list with a dictionary
+#for each stage
+def runBenchmark(benchmark, path, repeat):
+
+    stages = benchmarks[benchmark]
+    times = []
+    rows = 0
+
+    for i in range(repeat):
+
+        seconds, rows = runStages(stages, path)
+        times.append(seconds)
+
+    memory = runStages(stages, path, traced = True)[0]
+    results = []
+
+    for i in range(len(stages)):
+
+        results.append({"benchmark": benchmark, "stage": stages[i][0], "seconds": min([t[i] for t in times]), "peakMemory": memory[i]})
+
+    #Only the number of rows at the end is recorded
+    results[-1]["rows"] = rows
+
+    return results
+
+#This function takes a list of scales and how many times to time each
+#stage, and runs every benchmark at every scale, returning the results
+#as a dictionary that can be saved as JSON
+def runAll(scales, repeat):
+
+    results = []
+
+    with tempfile.TemporaryDirectory() as folder:
+
+        for scale in scales:
+
+            dictionaryPath = os.path.join(folder, "dictionary.txt")
+            corpusPath = os.path.join(folder, "Corpus.txt")
+
+            with open(dictionaryPath, encoding="utf-8", mode="w") as f:
+
+                f.write(makeDictionary(dictionarySize * scale))
+
+            with open(corpusPath, encoding="utf-8", mode="w") as f:
+
+                f.write(makeCorpus(scale))
+
+            for benchmark, path in [["pipeline", dictionaryPath], ["evaluator", corpusPath]]:
+
+                for stage in runBenchmark(benchmark, path, repeat):
+
+                    stage["scale"] = scale
+                    results.append(stage)
+
+                    print(f"{scale:>5}x  {benchmark:<10}{stage['stage']:<28}{stage['seconds']:>10.3f} s{stage['peakMemory'] / 2 ** 20:>10.1f} MB")
+
+    return {"date": time.strftime("%Y-%m-%d %H:%M:%S"), "python": platform.python_version(), "repeat": repeat, "results": results}
+
+#Print how long each stage took compared with an earlier run
+def compareResults(old, new):
+
+    oldTimes = {(r["scale"], r["benchmark"], r["stage"]): r["seconds"] for r in old["results"]}
+
+    print(f"Compared with the run on {old['date']}:")
+
+    for r in new["results"]:
+
+        key = (r["scale"], r["benchmark"], r["stage"])
+
+        if key in oldTimes and oldTimes[key] > 0:
+
+            print(f"{r['scale']:>5}x  {r['benchmark']:<10}{r['stage']:<28}{oldTimes[key]:>10.3f} s ->{r['seconds']:>8.3f} s  (speedup {oldTimes[key] / r['seconds']:.2f}x)")
+
+if __name__ == "__main__":
+
+    scales = [1, 10, 100]
+    repeat = 3
+
+    if "--scales" in sys.argv:
+
+        scales = [int(s) for s in sys.argv[sys.argv.index("--scales") + 1].split(",")]
+
+    if "--repeat" in sys.argv:
+
+        repeat = int(sys.argv[sys.argv.index("--repeat") + 1])
+
+    if "--output" in sys.argv:
+
+        outputFile = sys.argv[sys.argv.index("--output") + 1]
+
+    results = runAll(scales, repeat)
+
+    with open(outputFile, encoding="utf-8", mode="w") as f:
+
+        json.dump(results, f, indent = 1)
+
+    print(f"Results saved to {outputFile}")
+
+    if "--compare" in sys.argv:
+
+        with open(sys.argv[sys.argv.index("--compare") + 1], encoding="utf-8") as f:
+
+            compareResults(json.load(f), results)
@@ -0,0 +1,205 @@
+#This module contains the morpheme boundary fixes from 5. Fix
+#morpheme boundaries.py. Rows go through two rounds. prepareRow
+#adds boundaries we know must be there and fixes the negative,
+#one row at a time. Then, once every row has been through that,
+#finishRow breaks morphemes down using a lexicon of the whole
+#corpus (see segmentation.py), and checks the result against
+#the verb categories in paradigms.py.
+from segmentation import buildLexicon, reparse
+from paradigms import getTemplate
+
+#Function to fix negative morphemes in some form f
+#Returns the fixed form
+#Note: this assumes we know that the stem/preverb
+#don't contain "м"
+def fixNegatives(f):
+
+    #There are a bunch of ways in which the negative
+    #might be perfectly fine already. We check those
+    #and if we're fine, just return the input.
+    
+    if "-м-" in f:
+
+        return f
+
+    elif "-мы-" in f:
+
+        return f
+
+    elif "-мЫ-" in f:
+
+        return f
+
+    elif "-м(ы)-" in f:
+
+        return f
+
+    #If there's a problem with the negative parsing
+    else:
+
+        #Fix problem for schwaful version of marker
+        if "мы" in f or "мЫ" in f or "м(ы)" in f:
+
+            #Surround the negative marker with boundaries
+            f = f.replace("мы", "-мы-")
+            f = f.replace("мЫ", "-мЫ-")
+            f = f.replace("м(ы)", "-м(ы)-")
+
+            #Get rid of extra boundaries
+            while "--" in f:
+
+                f = f.replace("--", "-")
+
+            #Return fixed form
+            return f
+
+        #Same thing for schwaless version
+        if "м" in f:
+
+            f = f.replace("м", "-м-")
+
+            while "--" in f:
+
+                f = f.replace("--", "-")
+
+        return f
+
+#This function takes a list of verb forms as input
+#and returns a list with how many morpheme boundaries
+#each form has.
+def getBoundaries(tf):
+
+    tempBoundaries = []
+
+    for item in tf:
+
+        tempBoundaries.append(item.count("-"))
+
+    return tempBoundaries
+
+#This function takes a row (the seven verb forms and the gloss
+#string), and returns a list of the forms with the boundaries
+#that must be there added in, or None if the row can't be used
+def prepareRow(entry):
+
+    #A list for the conjugated forms
+    tempForms = entry[:-1]
+
+    #Some morphemes will always be present in particular positions. We check
+    #for these morpheme boundaries below, adding them in if they aren't
+    #already present. The way to do this is that if a string is supposed
+    #to start with, say, "ba-", then we want the third character to be "-".
+    #If it's not, we add a "-" in that position. The morphemes are:
+    #Masdar must have а- at the start and -ра at the end
+    #Pres. aff. must have -ит at the end
+    #Pres. neg. must have -м at the end
+    #Imp. neg. must have -н at the end
+    #Abs. aff. must have -ны at the end
+    #Abs. neg. must have -кәа at the end
+    if not tempForms[0][1] == "-":
+
+        tempForms[0] = tempForms[0][0] + "-" + tempForms[0][1:]
+
+    if not tempForms[0][-3] == "-":
+
+        tempForms[0] = tempForms[0][:-2] + "-" + tempForms[0][-2:]
+
+    if not tempForms[1][-3] == "-":
+
+        tempForms[1] = tempForms[1][:-2] + "-" + tempForms[1][-2:]
+
+    if not tempForms[2][-2] == "-":
+
+        tempForms[2] = tempForms[2][:-1] + "-" + tempForms[2][-1]
+
+    if not tempForms[4][-2] == "-":
+
+        tempForms[4] = tempForms[4][:-1] + "-" + tempForms[4][-1]
+
+    if not tempForms[5][-3] == "-":
+
+        tempForms[5] = tempForms[5][:-2] + "-" + tempForms[5][-2:]
+
+    if not tempForms[6][-4] == "-":
+
+        tempForms[6] = tempForms[6][:-3] + "-" + tempForms[6][-3:]
+
+    #Just making sure the neg. abs. ends in the right morpheme
+    if not tempForms[6].endswith("кәа") and not tempForms[6].endswith("кәА"):
+
+        return None
+
+    #We still want to do more automatic parsing if we can
+    #There are common errors with the negative not being
+    #parsed correctly. So we want to make sure "м", the
+    #negative marker, is included as a separate morpheme.
+    #We have to be careful with that grapheme appearing
+    #in roots and preverbs though!
+    #We've dealt with the only instances where it's word-
+    #final, so every negative form should contain "-м-" or
+    #"-мы-" or "-мЫ-"
+
+    #Only try to fix things if the masdar fails to contain
+    #this phoneme. Otherwise we'll do it manually
+    if "м" not in tempForms[0]:
+
+        tempForms[4] = fixNegatives(tempForms[4])
+        tempForms[6] = fixNegatives(tempForms[6])
+
+    return tempForms
+
+#This function takes the output of prepareRow and the lexicon
+#from buildLexicon, and returns the fully parsed forms with the
+#number string of the boundaries at the end, or None if the
+#verb doesn't fit any of the verb categories
+def finishRow(tempForms, lexicon):
+
+    #Automatic parsing to make sure all the morpheme
+    #boundaries are there
+    tempForms = reparse(tempForms, lexicon)
+
+    #If there isn't a conjugation pattern that has this
+    #pattern of morpheme boundaries (see paradigms.py)
+    if getTemplate(getBoundaries(tempForms)) is None:
+
+        #Returning None tells us to just ignore verbs
+        #that can't be automatically parsed. The commented-
+        #out code below allows for manual fixing of these
+        #forms, if desired in the future, as well as spot-
+        #checking of the automatically-parsed forms
+        return None
+
+        #print("Input correct forms by copy-pasting and fixing.")
+        #tempForms = input(", ".join(tempForms) + ": ").split(", ")
+        #Note that we save user input as is, without checking
+        #whether one of the templates is matched. So the next
+        #script still has to weed out forms based on whether
+        #they match one of the patterns or not
+
+    #else: #Spot-check 10% of automatic parses
+
+        #if random.random() < 0.1:
+        
+            #if len(input(", ".join(tempForms) + "; if correct, hit Enter, else type: ")) > 0:
+
+                #print("Input correct forms by copy-pasting and fixing.")
+                #tempForms = input(", ".join(tempForms) + ": ").split(", ")
+
+    #Return the forms, with the number string of the boundaries
+    #in each form at the end
+    return tempForms + ["".join(str(n) for n in getBoundaries(tempForms))]
+
+#This function takes a list of rows, and returns a list of the
+#rows that could be parsed, as returned by finishRow
+def fixBoundaries(rows):
+
+    tempRows = [prepareRow(entry) for entry in rows]
+    tempRows = [tempForms for tempForms in tempRows if tempForms is not None]
+
+    #reparse uses how often morphemes occur across the whole
+    #corpus, so we build a lexicon of every morpheme first
+    lexicon = buildLexicon(tempRows)
+
+    tempRows = [finishRow(tempForms, lexicon) for tempForms in tempRows]
+
+    return [tempForms for tempForms in tempRows if tempForms is not None]
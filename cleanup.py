@@ -0,0 +1,193 @@
+#This module contains the cleanup step of 2. Clean up verbs.py.
+#There are two kinds of cleanup. The replacements in rules apply
+#anywhere in the text. The truncation rules in cleanField apply
+#to one verb form at a time, depending on where in the form
+#something occurs. Each verb form is cleaned exactly once, and
+#only that form is changed, so a fix can't leak into other rows
+#that happen to contain the same string.
+from rewrite import RewriteRules
+
+#All of the replacements that apply anywhere in the text are
+#collected into one table, in order, and applied together by
+#RewriteRules (see extraction.py).
+rules = RewriteRules()
+
+#There are various indications of optionality
+#within forms. We want to get rid of these, so
+#we just have a replace command for each one.
+#Optional forms are separated by #. Below I keep
+#the first option arbitrarily, except I keep
+#feminine forms for imperatives
+rules.add("s#z", "s")
+rules.add("z#s", "z")
+rules.add("zy#sy", "zy")
+rules.add("sy#zy", "sy")
+rules.add("s#(z)", "s")
+rules.add("sy#(zy)", "sy")
+rules.add("a#r", "a")
+rules.add("u#b#w", "b")
+rules.add("u#by", "by")
+rules.add("u#b", "b")
+rules.add("a¡#ry¡", "a¡")
+rules.add("a#y", "a")
+
+#Some optional forms are separated by /. Here we
+#fix those as well.
+rules.add("sy¡/zy¡", "sy¡")
+rules.add("z/s", "z")
+
+#Two forms somehow contain "Abs." for no reason
+rules.add("Abs.", "")
+
+#One form contains equals signs for optionality
+rules.add("∞yzy=∞yz", "∞yz(y)")
+rules.add("∞yzy¡=∞yzy", "∞yzy¡")
+rules.add("∞yzy¡=∞yz(y)", "∞yzy¡")
+rules.add("∞yzy¡=∞yz", "∞yzy¡")
+
+#One form contains a random palatalization sign
+rules.add("n!;", "n")
+
+#Two forms have English "or" at the end of abs. neg.
+rules.add("-k´aor", "-k´a")
+
+#We do some punctuation removal here, where we need
+#to remove characters independently of where in a verb
+#form they occur. # is only included here because we've
+#dealt with the important # cases above. Semi-colons occur
+#legitimately as a diacritic, but also randomly after @.
+rules.add("@;", "@")
+rules.add("<", "")
+rules.add("@", "")
+rules.add("{", "")
+rules.add("}", "")
+rules.add("]", "")
+rules.add("*", "")
+rules.add("!", "")
+rules.add(".", "")
+rules.add("#", "")
+
+#Some strings contain parenthesized forms for optionality.
+#A few of these we want to actually deal with, and this is
+#done below. Most are parentheses we don't care about, e.g.
+#extra info about ungrammatical forms, versions of the
+#negative with an intensifier, and just things that should
+#be part of the next word, but a space was missed. After
+#dealing with the cases we want to deal with, everything
+#after ( in a string is garbage, and can be thrown out.
+
+#Keep optional a, which occurs in optionally truncatable
+#imperatives.
+#This is an arbitrary decision. It probably results in
+#some more uniformity across the paradigm.
+rules.add("(a)", "a")
+
+#Change the brackets around optional schwa, so these
+#don't get deleted. We'll change them back later.
+rules.add("(y)", "{y}")
+
+#I think this only affects one verb, stem aai. It's an
+#arbitrary decision. Again it results in more paradigm
+#uniformity.
+rules.add("(i)", "i")
+
+#One imperative has an optional repeated 2sg marker
+#it looks like. Don't know what that's about, but I'm
+#removing it arbitrarily.
+rules.add("(by)", "")
+
+#Remove the optional intensifier in some negatives.
+rules.add("(ӡa-)", "")
+
+#Later on, we'll want glosses to be upper case.
+#That's kind of standard anyway. So we implement
+#that here.
+rules.add("Prev", "PREV")
+
+#The names of the truncation rules in cleanField, in the order
+#they apply
+fieldRules = ["digits", ",", ">", "(", ")", "["]
+
+#Translation table that deletes the digits 1 to 9 (0 was
+#never removed, so we leave it alone)
+digits = str.maketrans("", "", "123456789")
+
+#This function takes a verb form, and returns it with the
+#truncation rules applied. If counts is a dictionary, the
+#number of forms each rule changed is added to it.
+def cleanField(verb, counts = None):
+
+    applied = []
+
+    #Get rid of numbers
+    if not verb == verb.translate(digits):
+
+        verb = verb.translate(digits)
+        applied.append("digits")
+
+    #Get rid of commas and anything after them
+    if "," in verb:
+
+        verb = verb[:verb.index(",")]
+        applied.append(",")
+
+    #> and text after that character is garbage
+    if ">" in verb:
+
+        verb = verb[:verb.index(">")]
+        applied.append(">")
+
+    #Any open parentheses left now have garbage to
+    #their right. So we throw that away.
+    if "(" in verb:
+
+        verb = verb[:verb.index("(")]
+        applied.append("(")
+
+    #Remove final right parentheses. Some of these are
+    #just random punctuation. Others are part of a
+    #genuine parenthetical, but we got rid of the
+    #rest of the parenthetical earlier
+    if verb.endswith(")"):
+
+        verb = verb[:-1]
+        applied.append(")")
+
+    #Open square brackets are also nonsense
+    if "[" in verb:
+
+        verb = verb[:verb.index("[")]
+        applied.append("[")
+
+    if counts is not None:
+
+        for rule in applied:
+
+            counts[rule] = counts.get(rule, 0) + 1
+
+    return verb
+
+#This function takes a row (a list of tab-separated fields) where
+#rules have already been applied, and returns the cleaned row. We
+#look at all except the last column, since that's reserved for
+#glosses. The brackets around optional schwa are changed back at
+#the same time.
+def cleanRow(row, counts = None):
+
+    row = [cleanField(verb, counts) for verb in row[:-1]] + row[-1:]
+
+    return [field.replace("{y}", "(y)") for field in row]
+
+#This function takes a list of rows, and returns them cleaned
+#up: first the replacements in rules, then the truncation rules
+#in cleanRow. The rows are joined up so that the replacements
+#can be done in one go (none of them contain a tab or newline).
+def cleanRows(rows, counts = None):
+
+    if not rows:
+
+        return []
+
+    text = rules.rewrite("\n".join(["\t".join(row) for row in rows]))
+
+    return [cleanRow(entry.split("\t"), counts) for entry in text.split("\n")]
@@ -0,0 +1,274 @@
+#This module contains the extraction step of 1. Extract verbs.py,
+#written so that the dictionary never has to be in memory all at
+#once. The dictionary is read in chunks, the replacements are
+#applied to the chunks as they arrive, the text is split into
+#entries at [verb], and each verb is passed on as soon as its
+#forms have been found. Memory use therefore doesn't depend on
+#the size of the dictionary.
+from rewrite import RewriteRules
+
+#All of the replacements below are collected into one table, in the
+#order they should apply. RewriteRules compiles the table into a
+#multi-pattern matcher, so the whole dictionary is rewritten in a
+#handful of passes rather than one pass per replacement. The order
+#of the table is kept: rules only share a pass if that gives the
+#same result as applying them one after the other.
+rules = RewriteRules()
+
+#Splitting it up at verb entries
+#All verb entries, as far as I can tell, have [tr. or [intr.
+#immediately after the headword now
+#I'm replacing these strings by [verb] and using that to split
+rules.add("[tr.", "[verb]")
+rules.add("[intr.", "[verb]")
+
+#Some verbs have a bracketed number between headword and grammatical
+#tag. We want to get rid of those, because the code below depends on
+#these things being directly adjacent.
+rules.add(" (1)", "")
+
+#Some forms are split across pages, so we want to remove page numbers
+#These are of the form \n- page.number.here -\n, and there are 589 pages.
+#I moved this code up a bit, because I was having problems with page
+#boundaries immediately preceded by # because of the code block below
+#this one. All 589 page numbers are removed in a single pass. This
+#is only different from removing them one page at a time if two
+#page numbers are directly adjacent, which never happens.
+rules.addGroup([("\n- " + str(i) + " -\n", "\n") for i in range(1, 590, 1)])
+
+#Some " / " strings are crucial because they split up positive and negative
+#verb forms. But they're variably read as " # " rather than " / ", so I
+#fix that here. Some slashes also straddle newlines, so we fix that too.
+#Sometimes a space doesn't show up on one side of the symbol, so I fix that.
+rules.add("# ", " # ")
+rules.add("  ", " ")
+rules.add(" #\n", " /\n")
+rules.add(" /\n", " / ")
+rules.add("\n# ", "\n/ ")
+rules.add("\n/ ", " / ")
+rules.add(" # ", " / ")
+
+#Some forms separated by comma and newline rather than comma and space
+#don't get picked up. I can easily fix that later, but I can also
+#just fix it here
+rules.add(",\n", ", ")
+
+#Good verb entries contain " / ", which is usually followed by a negative form.
+#But some just have the slash without a following negative, and move straight on
+#to the next tense. These are something like "[pres.] blah / [past]". So we get
+#rid of " / [" in favor of "[" here to solve this problem
+rules.add(" / [", "[")
+
+#glossStr can either contain -S for stem or -R for root. We normalize to -R.
+rules.add("-S", "-R")
+
+#One form has " (poten.) " before the negative, get rid of that
+rules.add(" (poten.)", "")
+
+#Some forms don't contain "1." before the definition, fix that
+rules.add("to bore", "1. to bore")
+rules.add("to smoke", "1. to smoke")
+
+#One verb has " (a¡mla) " 'hunger' before the absolutive, fix that
+rules.add(" (a¡mla) ", " ")
+
+#Some verbs have " (C1) " before absolutive forms
+rules.add(" (C1) ", " ")
+
+allowedGlossStr = ["C1-R", "C1-Prev-R", "C1-Prev-Prev-R", "C1-C2-R", "C1-C2-Prev-R", "C1-C2-Prev-Prev-R", "C1-C3-R", "C1-Prev-C3-R", "C1-Prev-Prev-C3-R", "C1-C2-C3-R", "C1-C2-Prev-C3-R", "C1-C2-Prev-Prev-C3-R"]
+
+#This function takes an open file, and yields its contents
+#in chunks of size characters
+def readChunks(f, size = 65536):
+
+    chunk = f.read(size)
+
+    while chunk:
+
+        yield chunk
+
+        chunk = f.read(size)
+
+#This function takes text in chunks, and yields the pieces
+#in between each occurrence of separator, just like
+#"".join(chunks).split(separator) but one piece at a time.
+#Only the piece we're currently reading is kept in memory.
+def splitEntries(chunks, separator = "[verb]"):
+
+    buffer = ""
+
+    for chunk in chunks:
+
+        buffer += chunk
+
+        if separator in buffer:
+
+            pieces = buffer.split(separator)
+            buffer = pieces.pop()
+
+            for piece in pieces:
+
+                yield piece
+
+    yield buffer
+
+#This function takes the dictionary split up at verb entries
+#(e.g. as a list, or from splitEntries) and yields a list of
+#the seven verb forms and the glossStr for every verb where
+#all relevant forms exist.
+#Since headwords precede the [verb] string that we're
+#splitting by, a headword and its conjugated forms will appear
+#at different, but immediately adjacent, places in the input.
+#So we only ever need to remember the previous item.
+def extractVerbs(items):
+
+    tempHeadword = ""
+    headword = False
+    realInf = ""
+    realPresAff = ""
+    realPresNeg = ""
+    realImpAff = ""
+    realImpNeg = ""
+    realAbsAff = ""
+    realAbsNeg = ""
+    glossStr = ""
+    conjFull = ""
+    conjPres = ""
+    conjImp = ""
+    conjAbs = ""
+    glossFull = ""
+    startIndex = 0
+    conjIndex = 0
+
+    for item in items:
+
+        #If this condition is true, we have a verb, and now we need to check
+        #that all conjugated forms are present
+        if headword:
+            #print("tempHeadword")
+            #input(tempHeadword)
+            headword = False
+            #conjFull is the string containing all conjugated forms somewhere
+            conjFull = item
+
+            #If there are non-finite forms, we want to make sure presents
+            #are not non-finite. This index helps us do this check by
+            #seeing where the "Non-" part of "Non-fin." occurs.
+            if "Non-" in conjFull:
+
+                conjIndex = conjFull.index("Non-")
+
+            else:
+
+                conjIndex = 100000
+
+            #This is to get the glossStr, which always appear in the first line
+            #of a verb entry
+            glossFull = conjFull.split("\n")[0]
+            #print("glossFull")
+            #input(glossFull)
+            #-R is always part of the glossStr, so its presence indicates we
+            #have a glossStr to extract
+            if "-R" in glossFull:
+
+                #A well-formed glossStr starts with either [C or [Prev
+                if "[C" in glossFull:
+
+                    startIndex = glossFull.index("[C") + 1
+
+                elif "[Prev" in glossFull:
+
+                    startIndex = glossFull.index("[Prev") + 1
+
+                else:
+
+                    startIndex = -1
+
+                #If we have a seemingly well-formed glossStr
+                if startIndex > -1:
+
+                    #Extract it
+                    glossStr = glossFull[startIndex:glossFull.index("-R") + 2]
+                
+                    #We want to make sure we have a glossStr we can understand. So we
+                    #only allow a few different ones. We have to get rid of parentheses
+                    #and other junk first though.
+
+                    #These are things that shouldn't be in parentheses
+                    glossStr = glossStr.replace("(C1)", "C1")
+                    glossStr = glossStr.replace("(C2)", "C2")
+
+                    #Anything else in parentheses we should ignore. This assumes there
+                    #is only one set of parentheses left, which I think is always true.
+                    if "(" in glossStr:
+                    
+                        glossStr = glossStr[:glossStr.index("(")] + glossStr[glossStr.index(")") + 1:]
+
+                    #print("glossStr")
+                    #input(glossStr)
+
+                    #Now we need to check we have one of the allowed glossStr strings left:
+                    if glossStr in allowedGlossStr:
+
+                        #These three start strings tell us we're dealing with simple verb cases rather than weird
+                        #reflexives, subjective version verbs, and so on
+                        if conjFull.startswith("]") or conjFull.startswith(" dynamic]"):
+                            #Make sure all TAM combinations are found
+                            if "[pres.]" in conjFull and "[imper.]" in conjFull and "Abs." in conjFull:
+
+                                #This string contains the present forms
+                                conjPres = conjFull[conjFull.index("[pres.]") + 7:conjFull.index("[imper.]")]
+                                #This string contains the imperative forms
+                                conjImp = conjFull[conjFull.index("[imper.]") + 8:conjFull.index("Abs.")]
+                                #This string contains the absolutive forms (up to definition of verb,
+                                #which starts with "1."
+                                conjAbs = conjFull[conjFull.index("Abs.") + 4:conjFull.index("1.")]
+
+                                #Make sure all verbs have negative forms for each TAM combination
+                                #These are indicacted with " / " between positive and negative forms
+                                if " / " in conjPres and " / " in conjImp and " / " in conjAbs:
+                                    #Get rid of statives, because more morphology is too hard.
+                                    if "-up" not in conjPres and "-u¡p" not in conjPres:
+
+                                        #At this point we know all forms are present, and we can save them
+                                        #We only split by " ", because some verb forms will have newlines
+                                        #in the middle, and we don't want to cut those up into two
+                                        #We also want to get rid of them afterwards with a replace command
+                                        #because otherwise, they'll mess up the output file
+                                        realInf = tempHeadword.replace("\n", "")
+                                        realPresAff = conjPres.strip().split(" ")[0].replace("\n", "")
+                                        realPresNeg = conjPres[conjPres.index(" / ") + 3:].split(" ")[0].replace("\n", "")
+                                        realImpAff = conjImp.strip().split(" ")[0].replace("\n", "")
+                                        realImpNeg = conjImp[conjImp.index(" / ") + 3:].split(" ")[0].replace("\n", "")
+                                        realAbsAff = conjAbs.strip().split(" ")[0].replace("\n", "")
+                                        realAbsNeg = conjAbs[conjAbs.index(" / ") + 3:].split(" ")[0].replace("\n", "")
+
+                                        #print("Output")
+                                        #input(" ".join([realInf, realPresAff, realPresNeg, realPastAff, realPastNeg, realImpAff, realImpNeg]))
+
+                                        #Some verbs are of the form object, new word, verbal complex, and I only extract the first word
+                                        #This means all verb forms are given as the same, just the object. We ignore those by checking
+                                        #that forms are non-identical
+                                        if not realPresAff == realPresNeg:
+                                            #Pass the verb forms on as soon as we have them
+                                            yield [realInf, realPresAff, realPresNeg, realImpAff, realImpNeg, realAbsAff, realAbsNeg, glossStr]
+
+        #We check for potential verb headwords at the end of each item
+        #since we split by verb tag, and the verb tag immediately
+        #precedes each headword
+        tempHeadword = item.split()[-1]
+        #We shouldn't include a morpheme boundary in this condition, because
+        #verbs that underlyingly start in /a/ don't have this boundary.
+        if tempHeadword.startswith("a"):
+            #We can't check if it endswith the infinitive suffix because
+            #some entries end in numbers for footnotes
+            if "-ra" in tempHeadword or "-ra¡" in tempHeadword:
+                #At this point we have a headword, and the next item will
+                #contain the conjugated forms
+                headword = True
+
+#This function takes an open dictionary file, and yields the
+#verbs in it one at a time
+def streamVerbs(f):
+
+    return extractVerbs(splitEntries(rules.rewriteStream(readChunks(f))))
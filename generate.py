@@ -0,0 +1,220 @@
+#This module does the opposite of the rest of the pipeline: rather
+#than getting forms out of the dictionary, it generates the seven
+#forms of a verb from its root, its category (one of the templates
+#in paradigms.py) and what goes in each of the other slots (person
+#markers and preverbs). The output is a row just like the ones in
+#6. Parsed forms.txt: orthography, phonology and gloss for each form,
+#followed by the gloss string.
+#Each template is compiled once, when this module is imported, into
+#a format string for the orthography and phonology of each form, with
+#the affixes already filled in and a field for each slot. Generating
+#a verb then only means working out what goes in each slot once, and
+#filling in fourteen strings, so millions of verbs can be generated
+#quickly. An empty root, or a slot the template needs that isn't
+#given, is a ValueError.
+#This is a rough model of Abkhaz morphophonology. Forms are generated
+#without stress, unless the root or a slot is given with a stressed
+#(capital) vowel, and the only rule applied is that a prefix with no
+#vowel gets ы before the negative marker. Run it with:
+#python generate.py INPUT OUTPUT
+#where each line of INPUT is a signature (see paradigms.py), a root,
+#and then the slots, e.g.
+#3442534	ж	C1=д PREV=ва C3=с
+import sys
+from functools import lru_cache
+
+from phonology import transcribeMorpheme
+from paradigms import templates, getSignature
+
+#The orthography of every affix in the templates. The dynamic marker
+#is уе before DYN.FIN and уа before NEG.
+affixes = {"DEF": "а", "INF": "ра", "DYN.FIN": "ит", "NEG": "м", "DYN.IMP": "н", "ABS": "ны", "NEG.ABS": "кәа"}
+
+#Vowels, in both cases. A prefix without any of these gets ы
+#before the negative marker (e.g. д-м- > ды-м-).
+vowels = "аыуиеоАЫУИЕО"
+
+#The second person marker, which goes in the subject slot of the
+#imperative
+imperativeMarker = "б"
+
+#A template compiled for generating forms: the orthography and
+#phonology format strings of each form, their glosses, and the
+#gloss string. Fields in the format strings are the names of slots,
+#with "y" added if the slot needs ы (see fillSlot), and "_" added in
+#the phonology.
+class CompiledTemplate:
+
+    def __init__(self, template):
+
+        glosses = template.glossString.split("-")
+
+        #The imperative is addressed to the agent (C3) if the verb
+        #has one, and to C1 if it doesn't
+        self.subject = "C3" if "C3" in glosses else "C1"
+        self.glosses = template.fullGlosses
+        self.glossString = template.glossString
+        self.orthography = []
+        self.phonology = []
+
+        for i in range(len(template.fullGlosses)):
+
+            orthography, phonology = self.compileForm(template.fullGlosses[i].split("-"), i in [3, 4])
+            self.orthography.append(orthography)
+            self.phonology.append(phonology)
+
+    #This function takes the glosses of the morphemes in a form, and
+    #whether it's an imperative, and returns its orthography and
+    #phonology format strings
+    def compileForm(self, glosses, imperative):
+
+        orthography = []
+        phonology = []
+
+        for j in range(len(glosses)):
+
+            gloss = glosses[j]
+            following = glosses[j + 1] if j + 1 < len(glosses) else ""
+
+            if gloss == "DYN":
+
+                affix = "уе" if following == "DYN.FIN" else "уа"
+
+            #The negative marker is also the suffix of the present
+            #negative, which is a gloss we can look up
+            elif gloss in affixes:
+
+                affix = affixes[gloss]
+
+            else:
+
+                #A slot: the root (or the root coalesced with the
+                #dynamic marker), a person marker, or a preverb
+                if imperative and gloss == self.subject:
+
+                    slot = "IMP"
+
+                else:
+
+                    slot = gloss.replace(".", "")
+
+                if following == "NEG":
+
+                    slot += "y"
+
+                orthography.append("{" + slot + "}")
+                phonology.append("{" + slot + "_}")
+
+                continue
+
+            orthography.append(affix)
+            phonology.append(transcribeMorpheme(affix))
+
+        return ["-".join(orthography), "-".join(phonology)]
+
+    #This function takes a root and a dictionary from slots to what
+    #goes in them (e.g. {"C1": "д", "PREV": "ва", "C3": "с"}), and
+    #returns a row like those in 6. Parsed forms.txt
+    def generate(self, root, slots):
+
+        if not root:
+
+            raise ValueError(f"{self.glossString} verbs need a root")
+
+        values = {}
+
+        for slot, value in [("R", root), ("RDYN", coalesce(root)), ("IMP", imperativeMarker)] + list(slots.items()):
+
+            for field, filled in zip(fieldNames[slot], fillSlot(value)):
+
+                values[field] = filled
+
+        row = []
+
+        try:
+
+            for i in range(len(self.glosses)):
+
+                row += [self.orthography[i].format_map(values), self.phonology[i].format_map(values), self.glosses[i]]
+
+        except KeyError as e:
+
+            raise ValueError(f"{self.glossString} verbs need something in {e.args[0].rstrip('y_')}")
+
+        return row + [self.glossString]
+
+#Coalescence of the root with the dynamic marker: а + уа > о
+def coalesce(root):
+
+    if root[-1:] in ["а", "А"]:
+
+        return root[:-1] + ("о" if root[-1] == "а" else "О")
+
+    return root + "о"
+
+#This function takes what goes in a slot, and returns it as it is,
+#as it is before the negative marker, and the phonology of both
+#(see CompiledTemplate). The same person markers, preverbs and roots
+#come up again and again, so we remember the most recent ones.
+@lru_cache(maxsize = 4096)
+def fillSlot(value):
+
+    if any([v in vowels for v in value]):
+
+        valueY = value
+
+    else:
+
+        valueY = value + "ы"
+
+    return (value, valueY, transcribeMorpheme(value), transcribeMorpheme(valueY))
+
+#The names of the fields that go with each slot, in the same order
+#as fillSlot
+class FieldNames(dict):
+
+    def __missing__(self, slot):
+
+        self[slot] = (slot, slot + "y", slot + "_", slot + "y_")
+
+        return self[slot]
+
+fieldNames = FieldNames()
+
+compiledTemplates = {signature: CompiledTemplate(template) for signature, template in templates.items()}
+
+#This function takes a signature (see paradigms.py), a root and a
+#dictionary from slots to what goes in them, and returns a row like
+#those in 6. Parsed forms.txt
+def generateRow(signature, root, slots):
+
+    return compiledTemplates[getSignature(signature)].generate(root, slots)
+
+#This function takes rows of [signature, root, slots], and yields a
+#generated row for each one
+def generateRows(entries):
+
+    for signature, root, slots in entries:
+
+        yield generateRow(signature, root, slots)
+
+#This function takes a line of input to the script (see the top of
+#this file), and returns it as [signature, root, slots]
+def readEntry(line):
+
+    columns = line.split("\t")
+    slots = dict([slot.split("=") for slot in columns[2].split()]) if len(columns) > 2 else {}
+
+    return [columns[0], columns[1], slots]
+
+if __name__ == "__main__":
+
+    with open(sys.argv[1], encoding="utf-8") as f:
+
+        entries = [readEntry(line) for line in f.read().split("\n") if line]
+
+    with open(sys.argv[2], encoding="utf-8", mode="w") as f:
+
+        f.write("\n".join(["\t".join(row) for row in generateRows(entries)]))
+
+    print(f"{len(entries)} verbs generated")
@@ -0,0 +1,130 @@
+#This script runs the first four stages of the pipeline (the same
+#steps as scripts 1 to 4) with the replacement tables instrumented
+#(see instrument in rewrite.py), to find out which rules actually
+#apply to the dictionary, how often, and where the time goes. Rules
+#that never apply can be pruned, and the slowest passes are the
+#ones worth speeding up. The truncation rules in cleanup.py are
+#counted too, with the counts cleanRows already keeps.
+#The results are saved as JSON, and as a summary sorted by time
+#and by number of hits. Run it with:
+#python instrument.py [DICTIONARY]
+import sys
+import json
+import time
+
+import extraction
+import cleanup
+import orthography
+from pipeline import dictionaryFile, extractStage, stressStage
+from cleanup import cleanRows
+from orthography import transliterateRows
+
+#The replacement tables, by the name we report them under
+tables = {
+    "1. extraction": extraction.rules,
+    "2. cleanup": cleanup.rules,
+    "4. orthography": orthography.transliterator.rules
+    }
+
+jsonFile = "rule stats.json"
+summaryFile = "rule stats.txt"
+
+#This function takes the path to the dictionary, runs stages 1 to
+#4 on it, and returns how often every rule applied and how long
+#every pass and stage took, as a dictionary that can be saved as JSON
+def instrumentStages(path):
+
+    for rules in tables.values():
+
+        rules.instrument()
+
+    fieldCounts = {}
+    stageSeconds = {}
+
+    start = time.perf_counter()
+    rows = extractStage(path)
+    stageSeconds["1. extraction"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    rows = cleanRows(rows, fieldCounts)
+    stageSeconds["2. cleanup"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    rows = stressStage(rows)
+    stageSeconds["3. stress"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    rows = transliterateRows(rows)
+    stageSeconds["4. orthography"] = time.perf_counter() - start
+
+    results = {"dictionary": path, "rows": len(rows), "stageSeconds": stageSeconds, "tables": {}}
+
+    for name, rules in tables.items():
+
+        results["tables"][name] = rules.report()
+
+    results["fieldRules"] = {rule: fieldCounts.get(rule, 0) for rule in cleanup.fieldRules}
+
+    return results
+
+#This function takes the results of instrumentStages, and returns a
+#summary as a list of lines: for each table, the passes from slowest
+#to fastest, the rules from most to fewest hits, and the rules that
+#never applied
+def summarize(results):
+
+    lines = [f"{results['rows']} rows from {results['dictionary']}", ""]
+
+    for name, seconds in results["stageSeconds"].items():
+
+        lines.append(f"{name:<20}{seconds:>10.3f} s")
+
+    for name, report in results["tables"].items():
+
+        lines += ["", f"{name}: passes, slowest first"]
+
+        for p in sorted(report["passes"], key = lambda p: p["seconds"], reverse = True):
+
+            lines.append(f"  pass {p['pass']:<4}{p['rules']:>5} rules{p['hits']:>10} hits{p['seconds']:>10.4f} s")
+
+        lines += ["", f"{name}: rules, most hits first"]
+
+        for r in sorted(report["rules"], key = lambda r: r["hits"], reverse = True):
+
+            if r["hits"]:
+
+                lines.append(f"  {r['hits']:>8}  {r['old']!r} -> {r['new']!r} (pass {r['pass']})")
+
+        dead = [r for r in report["rules"] if not r["hits"]]
+        lines += ["", f"{name}: {len(dead)} rules never applied"]
+
+        for r in dead:
+
+            lines.append(f"  {r['old']!r} -> {r['new']!r} (pass {r['pass']})")
+
+    lines += ["", "2. cleanup: truncation rules"]
+
+    for rule, count in sorted(results["fieldRules"].items(), key = lambda item: item[1], reverse = True):
+
+        lines.append(f"  {count:>8}  {rule}")
+
+    return lines
+
+if __name__ == "__main__":
+
+    path = sys.argv[1] if len(sys.argv) > 1 else dictionaryFile
+    results = instrumentStages(path)
+    lines = summarize(results)
+
+    with open(jsonFile, encoding="utf-8", mode="w") as f:
+
+        json.dump(results, f, indent = 1, ensure_ascii = False)
+
+    with open(summaryFile, encoding="utf-8", mode="w") as f:
+
+        f.write("\n".join(lines))
+
+    #The full lists of rules can be long, so only the start of the
+    #summary is shown here
+    print("\n".join(lines[:40]))
+    print(f"...\nFull results saved to {jsonFile} and {summaryFile}")
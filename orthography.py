@@ -0,0 +1,72 @@
+#This module contains the conversion from the mangled OCR in the
+#dictionary to actual Abkhaz orthography, used by 4. Convert to
+#orthography.py. Glosses must be upper-case, otherwise Prev in
+#glosses will come out with some cyrillic characters.
+from rewrite import RewriteRules
+
+#These dictionaries are matched in number and order, so that dictIn[i]
+#should be replaced by dictOut[i]. The list must be iterated through
+#in ascending order of indices, because there are some crucial orderings.
+
+#Note that dictIn and dictOut are different from these variables
+#in other versions of this script in other folders. The old ones
+#contained replacements for morpheme boundaries, which we don't
+#want to get rid of right now.
+dictIn = ["a¡", "y¡", "u¡", "i¡", "e¡", "o¡", ";", "´", "ә", "ь", "b", "v", "g", "ҕ", "d", "'", "z", "ӡ", "k", "º", "ҟ", "l", "m", "n", "p", "ҧ", "r", "s", "t", "ҭ", "f", "x", "≈", "c", "ҵ", "h", "˙", "ҽ", "w", "ҩ", "ҿ", "ç", "∞", "a", "y", "e", "o", "i", "u"]
+dictOut = ["А", "Ы", "У", "И", "Е", "О", "ь", "ә", "ә", "ь", "б", "в", "г", "ҕ", "д", "ж", "з", "ӡ", "к", "қ", "ҟ", "л", "м", "н", "п", "ҧ", "р", "с", "т", "ҭ", "ф", "х", "ҳ", "ц", "ҵ", "ч", "ҷ", "ҽ", "ш", "ҩ", "ҿ", "џ", "ҕ", "а", "ы", "е", "о", "и", "у"]
+
+#A Transliterator compiles a table of replacements like dictIn and
+#dictOut once, and then converts text in a single left-to-right
+#pass, always taking the longest entry in the table that matches.
+#This gives the same output as applying the replacements one after
+#the other in order, as long as the ordering of the table doesn't
+#matter for longest match. If it does (e.g. "a" comes before "a¡",
+#so "a¡" could never apply), compiling records the problem in
+#conflicts, and the table is split into as many passes as needed
+#to still get the same output as the ordered replacements.
+class Transliterator:
+
+    def __init__(self, tableIn, tableOut):
+
+        self.rules = RewriteRules(zip(tableIn, tableOut)).compile()
+        self.conflicts = self.rules.conflicts
+
+        #Forms in a batch are joined with this character and
+        #converted in one go, which only works if no entry in
+        #the table contains it
+        self.separator = "\n"
+
+        for old, new in self.rules.rules:
+
+            if "\n" in old or "\n" in new:
+
+                self.separator = None
+
+    def transliterate(self, text):
+
+        return self.rules.rewrite(text)
+
+    #Convert a list of forms, and return a list of the results in
+    #the same order
+    def transliterateBatch(self, forms):
+
+        #Joining no forms would give one empty one
+        if not forms:
+
+            return []
+
+        if self.separator is None:
+
+            return [self.rules.rewrite(form) for form in forms]
+
+        return self.rules.rewrite(self.separator.join(forms)).split(self.separator)
+
+transliterator = Transliterator(dictIn, dictOut)
+
+#This function takes a list of rows, and returns them converted
+#to orthography
+def transliterateRows(rows):
+
+    converted = transliterator.transliterateBatch(["\t".join(row) for row in rows])
+
+    return [entry.split("\t") for entry in converted]
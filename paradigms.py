@@ -0,0 +1,64 @@
+#This module is the one place where the verb categories (paradigms)
+#we're dealing with are defined. It's used by 5. Fix morpheme
+#boundaries.py and 6. Parse forms.py.
+#Every verb category has a signature: how many morpheme boundaries
+#each of the seven forms has (see 4.5). The signatures correspond
+#one-to-one with verb categories. Each category also has its old
+#gloss string (e.g. C1-PREV-R), and the full gloss of each of the
+#seven forms. Templates are stored in a dictionary keyed by the
+#signature, so looking one up doesn't depend on how many there are.
+from collections import namedtuple
+
+Template = namedtuple("Template", ["signature", "glossString", "fullGlosses"])
+
+templates = {}
+
+#This function takes a signature, either as a list of numbers
+#(e.g. [2, 2, 2, 1, 3, 2, 3]) or as the string of those numbers
+#we save in files (e.g. "2221323"), and returns it as a tuple
+def getSignature(signature):
+
+    if isinstance(signature, str):
+
+        return tuple([int(n) for n in signature])
+
+    return tuple(signature)
+
+#Add a new verb category
+def addTemplate(signature, glossString, fullGlosses):
+
+    signature = getSignature(signature)
+    templates[signature] = Template(signature, glossString, fullGlosses)
+
+#Return the Template for a signature, or None if no verb category
+#has this pattern of morpheme boundaries
+def getTemplate(signature):
+
+    return templates.get(getSignature(signature))
+
+#The verb categories. Each pair of categories differs in whether
+#the root coalesces with the dynamic marker (R.DYN) or not.
+addTemplate("2221323", "C1-R", ["DEF-R-INF", "C1-R.DYN-DYN.FIN", "C1-R.DYN-NEG", "C1-R", "C1-NEG-R-DYN.IMP", "C1-R-ABS", "C1-NEG-R-NEG.ABS"])
+addTemplate("2331323", "C1-R", ["DEF-R-INF", "C1-R-DYN-DYN.FIN", "C1-R-DYN-NEG", "C1-R", "C1-NEG-R-DYN.IMP", "C1-R-ABS", "C1-NEG-R-NEG.ABS"])
+addTemplate("3332434", "C1-PREV-R", ["DEF-PREV-R-INF", "C1-PREV-R.DYN-DYN.FIN", "C1-PREV-R.DYN-NEG", "C1-PREV-R", "C1-PREV-NEG-R-DYN.IMP", "C1-PREV-R-ABS", "C1-PREV-NEG-R-NEG.ABS"])
+addTemplate("3442434", "C1-PREV-R", ["DEF-PREV-R-INF", "C1-PREV-R-DYN-DYN.FIN", "C1-PREV-R-DYN-NEG", "C1-PREV-R", "C1-PREV-NEG-R-DYN.IMP", "C1-PREV-R-ABS", "C1-PREV-NEG-R-NEG.ABS"])
+addTemplate("4443545", "C1-PREV-PREV2-R", ["DEF-PREV-PREV2-R-INF", "C1-PREV-PREV2-R.DYN-DYN.FIN", "C1-PREV-PREV2-R.DYN-NEG", "C1-PREV-PREV2-R", "C1-PREV-PREV2-NEG-R-DYN.IMP", "C1-PREV-PREV2-R-ABS", "C1-PREV-PREV2-NEG-R-NEG.ABS"])
+addTemplate("4553545", "C1-PREV-PREV2-R", ["DEF-PREV-PREV2-R-INF", "C1-PREV-PREV2-R-DYN-DYN.FIN", "C1-PREV-PREV2-R-DYN-NEG", "C1-PREV-PREV2-R", "C1-PREV-PREV2-NEG-R-DYN.IMP", "C1-PREV-PREV2-R-ABS", "C1-PREV-PREV2-NEG-R-NEG.ABS"])
+addTemplate("2332434", "C1-C2-R", ["DEF-R-INF", "C1-C2-R.DYN-DYN.FIN", "C1-C2-R.DYN-NEG", "C1-C2-R", "C1-C2-NEG-R-DYN.IMP", "C1-C2-R-ABS", "C1-C2-NEG-R-NEG.ABS"])
+addTemplate("2442434", "C1-C2-R", ["DEF-R-INF", "C1-C2-R-DYN-DYN.FIN", "C1-C2-R-DYN-NEG", "C1-C2-R", "C1-C2-NEG-R-DYN.IMP", "C1-C2-R-ABS", "C1-C2-NEG-R-NEG.ABS"])
+addTemplate("3443545", "C1-C2-PREV-R", ["DEF-PREV-R-INF", "C1-C2-PREV-R.DYN-DYN.FIN", "C1-C2-PREV-R.DYN-NEG", "C1-C2-PREV-R", "C1-C2-PREV-NEG-R-DYN.IMP", "C1-C2-PREV-R-ABS", "C1-C2-PREV-NEG-R-NEG.ABS"])
+addTemplate("3553545", "C1-C2-PREV-R", ["DEF-PREV-R-INF", "C1-C2-PREV-R-DYN-DYN.FIN", "C1-C2-PREV-R-DYN-NEG", "C1-C2-PREV-R", "C1-C2-PREV-NEG-R-DYN.IMP", "C1-C2-PREV-R-ABS", "C1-C2-PREV-NEG-R-NEG.ABS"])
+addTemplate("4554656", "C1-C2-PREV-PREV2-R", ["DEF-PREV-PREV2-R-INF", "C1-C2-PREV-PREV2-R.DYN-DYN.FIN", "C1-C2-PREV-PREV2-R.DYN-NEG", "C1-C2-PREV-PREV2-R", "C1-C2-PREV-PREV2-NEG-R-DYN.IMP", "C1-C2-PREV-PREV2-R-ABS", "C1-C2-PREV-PREV2-NEG-R-NEG.ABS"])
+addTemplate("4664656", "C1-C2-PREV-PREV2-R", ["DEF-PREV-PREV2-R-INF", "C1-C2-PREV-PREV2-R-DYN-DYN.FIN", "C1-C2-PREV-PREV2-R-DYN-NEG", "C1-C2-PREV-PREV2-R", "C1-C2-PREV-PREV2-NEG-R-DYN.IMP", "C1-C2-PREV-PREV2-R-ABS", "C1-C2-PREV-PREV2-NEG-R-NEG.ABS"])
+addTemplate("2331423", "C1-C3-R", ["DEF-R-INF", "C1-C3-R.DYN-DYN.FIN", "C1-C3-R.DYN-NEG", "C1-R", "C1-C3-NEG-R-DYN.IMP", "C1-R-ABS", "C1-NEG-R-NEG.ABS"])
+addTemplate("2441423", "C1-C3-R", ["DEF-R-INF", "C1-C3-R-DYN-DYN.FIN", "C1-C3-R-DYN-NEG", "C1-R", "C1-C3-NEG-R-DYN.IMP", "C1-R-ABS", "C1-NEG-R-NEG.ABS"])
+addTemplate("3442534", "C1-PREV-C3-R", ["DEF-PREV-R-INF", "C1-PREV-C3-R.DYN-DYN.FIN", "C1-PREV-C3-R.DYN-NEG", "C1-PREV-R", "C1-PREV-C3-NEG-R-DYN.IMP", "C1-PREV-R-ABS", "C1-PREV-NEG-R-NEG.ABS"])
+addTemplate("3552534", "C1-PREV-C3-R", ["DEF-PREV-R-INF", "C1-PREV-C3-R-DYN-DYN.FIN", "C1-PREV-C3-R-DYN-NEG", "C1-PREV-R", "C1-PREV-C3-NEG-R-DYN.IMP", "C1-PREV-R-ABS", "C1-PREV-NEG-R-NEG.ABS"])
+addTemplate("4553645", "C1-PREV-PREV2-C3-R", ["DEF-PREV-PREV2-R-INF", "C1-PREV-PREV2-C3-R.DYN-DYN.FIN", "C1-PREV-PREV2-C3-R.DYN-NEG", "C1-PREV-PREV2-R", "C1-PREV-PREV2-C3-NEG-R-DYN.IMP", "C1-PREV-PREV2-R-ABS", "C1-PREV-PREV2-NEG-R-NEG.ABS"])
+addTemplate("4663645", "C1-PREV-PREV2-C3-R", ["DEF-PREV-PREV2-R-INF", "C1-PREV-PREV2-C3-R-DYN-DYN.FIN", "C1-PREV-PREV2-C3-R-DYN-NEG", "C1-PREV-PREV2-R", "C1-PREV-PREV2-C3-NEG-R-DYN.IMP", "C1-PREV-PREV2-R-ABS", "C1-PREV-PREV2-NEG-R-NEG.ABS"])
+addTemplate("2442534", "C1-C2-C3-R", ["DEF-PREV-R-INF", "C1-C2-PREV-C3-R.DYN-DYN.FIN", "C1-C2-PREV-C3-R.DYN-NEG", "C1-C2-PREV-R", "C1-C2-PREV-C3-NEG-R-DYN.IMP", "C1-C2-PREV-R-ABS", "C1-C2-PREV-NEG-R-NEG.ABS"])
+addTemplate("2552534", "C1-C2-C3-R", ["DEF-PREV-R-INF", "C1-C2-PREV-C3-R-DYN-DYN.FIN", "C1-C2-PREV-C3-R-DYN-NEG", "C1-C2-PREV-R", "C1-C2-PREV-C3-NEG-R-DYN.IMP", "C1-C2-PREV-R-ABS", "C1-C2-PREV-NEG-R-NEG.ABS"])
+addTemplate("3553645", "C1-C2-PREV-C3-R", ["DEF-PREV-R-INF", "C1-C2-PREV-C3-R.DYN-DYN.FIN", "C1-C2-PREV-C3-R.DYN-NEG", "C1-C2-PREV-R", "C1-C2-PREV-C3-NEG-R-DYN.IMP", "C1-C2-PREV-R-ABS", "C1-C2-PREV-NEG-R-NEG.ABS"])
+addTemplate("3663645", "C1-C2-PREV-C3-R", ["DEF-PREV-R-INF", "C1-C2-PREV-C3-R-DYN-DYN.FIN", "C1-C2-PREV-C3-R-DYN-NEG", "C1-C2-PREV-R", "C1-C2-PREV-C3-NEG-R-DYN.IMP", "C1-C2-PREV-R-ABS", "C1-C2-PREV-NEG-R-NEG.ABS"])
+addTemplate("4664756", "C1-C2-PREV-PREV2-C3-R", ["DEF-PREV-PREV2-R-INF", "C1-C2-PREV-PREV2-C3-R.DYN-DYN.FIN", "C1-C2-PREV-PREV2-C3-R.DYN-NEG", "C1-C2-PREV-PREV2-R", "C1-C2-PREV-PREV2-C3-NEG-R-DYN.IMP", "C1-C2-PREV-PREV2-R-ABS", "C1-C2-PREV-PREV2-NEG-R-NEG.ABS"])
+addTemplate("4774756", "C1-C2-PREV-PREV2-C3-R", ["DEF-PREV-PREV2-R-INF", "C1-C2-PREV-PREV2-C3-R-DYN-DYN.FIN", "C1-C2-PREV-PREV2-C3-R-DYN-NEG", "C1-C2-PREV-PREV2-R", "C1-C2-PREV-PREV2-C3-NEG-R-DYN.IMP", "C1-C2-PREV-PREV2-R-ABS", "C1-C2-PREV-PREV2-NEG-R-NEG.ABS"])
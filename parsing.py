@@ -0,0 +1,27 @@
+#This module contains the last step of the pipeline, from
+#6. Parse forms.py: adding individual glosses for every verb
+#form, as well as a rough phonological transcription.
+from phonology import getPhonology
+from paradigms import getTemplate
+
+#This function takes a row with correct morpheme boundaries
+#(the seven verb forms and the number string of boundaries),
+#and returns the orthography, phonology, and gloss for each
+#form, followed by the gloss string
+def parseRow(entry):
+
+    #Get the verb forms
+    tempForms = entry[:-1]
+    #Every verb entry in the dataset ends in the number string
+    #of one of the verb categories in paradigms.py, which tells
+    #us the full glosses and the gloss string for this row
+    tempTemplate = getTemplate(entry[-1])
+    tempRow = []
+
+    #Add the orthography, phonology, and gloss for each form
+    for i in range(len(tempForms)):
+
+        tempRow += [tempForms[i], getPhonology(tempForms[i]), tempTemplate.fullGlosses[i]]
+
+    #Add the gloss string
+    return tempRow + [tempTemplate.glossString]
@@ -0,0 +1,34 @@
+#This module contains the rough phonological transcription used
+#by 6. Parse forms.py. All consonants are replaced by C. All vowels
+#are retained as is, except high vowels/glides are G if stressed,
+#and g elsewhere.
+from functools import lru_cache
+
+dictIn = ["А", "Ы", "У", "И", "Е", "О", "ә", "ь", "б", "в", "г", "ҕ", "д", "ж", "з", "ӡ", "к", "қ", "ҟ", "л", "м", "н", "п", "ҧ", "р", "с", "т", "ҭ", "ф", "х", "ҳ", "ц", "ҵ", "ч", "ҷ", "ҽ", "ш", "ҩ", "ҿ", "џ", "ҕ", "а", "ы", "е", "о", "и", "у"]
+dictOt = ["A", "Y", "G", "G", "E", "O", "", "", "C", "C", "C", "C", "C", "C", "C", "C", "C", "C", "C", "C", "C", "C", "C", "C", "C", "C", "C", "C", "C", "C", "C", "C", "C", "C", "C", "C", "C", "C", "C", "C", "C", "a", "y", "e", "o", "g", "g"]
+
+#Every entry in dictIn is a single character, and nothing in dictOt
+#is in dictIn, so replacing each entry in turn is the same as
+#replacing every character at once. We compile the lists into a
+#single translation table. If a character is in dictIn twice, the
+#first entry wins, as it would have when replacing in order.
+phonologyTable = {}
+
+for i in range(len(dictIn)):
+
+    if ord(dictIn[i]) not in phonologyTable:
+
+        phonologyTable[ord(dictIn[i])] = dictOt[i]
+
+#The same affixes and roots come up again and again across the
+#corpus, so we remember the transcription of the most recent
+#morphemes rather than working them out every time
+@lru_cache(maxsize = 4096)
+def transcribeMorpheme(m):
+
+    return m.translate(phonologyTable)
+
+#Return a phonological version of each form, morpheme by morpheme
+def getPhonology(st):
+
+    return "-".join([transcribeMorpheme(m) for m in st.split("-")])
@@ -0,0 +1,290 @@
+#This module runs the whole corpus creation pipeline (the same
+#steps as scripts 1 to 6) in memory. Each stage takes a list of
+#rows, where a row is a list of tab-separated fields, and returns
+#a new list of rows for the next stage, so nothing has to be
+#written out and read back in between stages. The text files the
+#scripts produce (1. verb forms.txt to 6. parsed forms.txt) can
+#still be written along the way as checkpoints, but they're
+#optional.
+#With the cache switched on, each stage records a hash of its input
+#and of its own rule tables and code. When we run the pipeline again,
+#a stage whose input and rules haven't changed is skipped, and its
+#output is read back from its checkpoint file instead. So changing a
+#rule in one stage only reruns that stage and the ones after it, and
+#only if its output actually changed.
+#Stages 2, 3, 5 and 6 look at one row at a time, so they can also
+#be run on several processes at once: the rows are split into
+#chunks, each chunk goes to a worker, and the results are put back
+#together in the original order. Run it with:
+#python pipeline.py [--checkpoints] [--cache] [--workers N]
+import os
+import sys
+import json
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+
+import extraction
+import cleanup
+import orthography
+import segmentation
+import paradigms
+import phonology
+from extraction import streamVerbs
+from cleanup import cleanRows
+from stress import filterRows
+from orthography import transliterateRows
+from boundaries import fixBoundaries, prepareRow, finishRow
+from segmentation import buildLexicon
+from parsing import parseRow
+
+#The dictionary the pipeline starts from (see 1. Extract verbs.py)
+dictionaryFile = "full dictionary (manual labile replacement).txt"
+
+#Stage 1: this one takes the path to the dictionary rather than rows
+def extractStage(path):
+
+    with open(path, encoding="utf-8") as f:
+
+        return list(streamVerbs(f))
+
+#Stage 3
+def stressStage(rows):
+
+    return list(filterRows(rows))
+
+#Stage 6
+def parseStage(rows):
+
+    return [parseRow(entry) for entry in rows]
+
+#Split rows into chunks, so that each worker gets a few of them
+def getChunks(rows, workers):
+
+    size = max(1, -(-len(rows) // (workers * 4)))
+
+    return [rows[i:i + size] for i in range(0, len(rows), size)]
+
+#Run a function that takes and returns a list of rows on every
+#chunk, and join the results back up in order
+def mapChunks(function, rows, workers, initializer = None, initargs = ()):
+
+    with ProcessPoolExecutor(workers, initializer = initializer, initargs = initargs) as pool:
+
+        return [entry for chunk in pool.map(function, getChunks(rows, workers)) for entry in chunk]
+
+#Each worker gets its own copy of the lexicon once, when it starts,
+#rather than with every chunk
+workerLexicon = None
+
+def setLexicon(lexicon):
+
+    global workerLexicon
+    workerLexicon = lexicon
+
+def prepareChunk(rows):
+
+    return [prepareRow(entry) for entry in rows]
+
+def finishChunk(rows):
+
+    return [finishRow(tempForms, workerLexicon) for tempForms in rows]
+
+#The parallel versions of the stages. They give exactly the same
+#output as the ones above.
+def parallelCleanStage(rows, workers):
+
+    return mapChunks(cleanRows, rows, workers)
+
+def parallelStressStage(rows, workers):
+
+    return mapChunks(stressStage, rows, workers)
+
+#Stage 5 has to see every row before it can build the lexicon,
+#so it's done in two rounds, like fixBoundaries
+def parallelBoundaryStage(rows, workers):
+
+    tempRows = mapChunks(prepareChunk, rows, workers)
+    tempRows = [tempForms for tempForms in tempRows if tempForms is not None]
+    lexicon = buildLexicon(tempRows)
+    tempRows = mapChunks(finishChunk, tempRows, workers, setLexicon, (lexicon,))
+
+    return [tempForms for tempForms in tempRows if tempForms is not None]
+
+def parallelParseStage(rows, workers):
+
+    return mapChunks(parseStage, rows, workers)
+
+#The stages, in order, with the checkpoint file each one writes,
+#the rule tables it uses, the files its code is in (if any of
+#the tables or files change, the stage is rerun), and the
+#parallel version of the stage, if there is one.
+#Stage 5 doesn't need the PREV-PREV2 replacement from the script,
+#since it only affects the gloss column, which stage 5 drops.
+stages = [
+    ["1. verb forms.txt", extractStage, [extraction.rules.rules, extraction.allowedGlossStr], ["extraction.py", "rewrite.py"], None],
+    ["2. cleaned.txt", cleanRows, [cleanup.rules.rules, cleanup.fieldRules], ["cleanup.py", "rewrite.py"], parallelCleanStage],
+    ["3. stresses.txt", stressStage, [], ["stress.py"], parallelStressStage],
+    ["4. orthography.txt", transliterateRows, [orthography.dictIn, orthography.dictOut], ["orthography.py", "rewrite.py"], None],
+    ["5. morpheme boundaries.txt", fixBoundaries, [segmentation.seeds, sorted(paradigms.templates)], ["boundaries.py", "segmentation.py"], parallelBoundaryStage],
+    ["6. parsed forms.txt", parseStage, [phonology.dictIn, phonology.dictOt, sorted(paradigms.templates.values())], ["parsing.py", "phonology.py"], parallelParseStage]
+    ]
+
+#The file where the cache keeps its hashes
+cacheFile = "pipeline cache.json"
+
+#The code files of each stage are next to this one, wherever the
+#pipeline is run from
+codeFolder = os.path.dirname(os.path.abspath(__file__))
+
+#Write rows to a file in the same format as the scripts: tab-
+#separated, one row per line, no newline at the end
+def writeRows(path, rows):
+
+    with open(path, encoding="utf-8", mode="w") as f:
+
+        f.write("\n".join(["\t".join(entry) for entry in rows]))
+
+#Read rows back in from a file written by writeRows
+def readRows(path):
+
+    with open(path, encoding="utf-8") as f:
+
+        s = f.read()
+
+    if not s:
+
+        return []
+
+    return [entry.split("\t") for entry in s.split("\n")]
+
+#Return the hash of a file's contents, reading it in chunks
+def getFileHash(path):
+
+    h = hashlib.sha256()
+
+    with open(path, mode="rb") as f:
+
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+
+            h.update(chunk)
+
+    return h.hexdigest()
+
+#Return the hash of a stage's rule tables and code
+def getRulesHash(stage):
+
+    h = hashlib.sha256(repr(stage[2]).encode("utf-8"))
+
+    for path in stage[3]:
+
+        with open(os.path.join(codeFolder, path), mode="rb") as f:
+
+            h.update(f.read())
+
+    return h.hexdigest()
+
+#Run every stage, and return the rows from the last one. If
+#checkpoints is True, each stage's output is also written to
+#its checkpoint file. If cache is True, stages whose input and
+#rules haven't changed since the last run are skipped (see the
+#top of this file), which also means checkpoints are written. If
+#workers is more than 1, the stages that can be run in parallel
+#are run on that many processes.
+def runPipeline(path = dictionaryFile, checkpoints = False, cache = False, workers = 1):
+
+    hashes = {}
+
+    if cache:
+
+        checkpoints = True
+
+        try:
+
+            with open(cacheFile, encoding="utf-8") as f:
+
+                hashes = json.load(f)
+
+        except (FileNotFoundError, ValueError):
+
+            hashes = {}
+
+    rows = path
+    inputHash = getFileHash(path) if cache else ""
+
+    for i in range(len(stages)):
+
+        checkpoint, stage = stages[i][:2]
+
+        if cache:
+
+            rulesHash = getRulesHash(stages[i])
+            saved = hashes.get(checkpoint, {})
+
+            #Skip the stage if nothing it depends on has changed,
+            #and its output is still where we left it
+            try:
+
+                skip = saved.get("input") == inputHash and saved.get("rules") == rulesHash and getFileHash(checkpoint) == saved.get("output")
+
+            except FileNotFoundError:
+
+                skip = False
+
+            if skip:
+
+                print(f"{checkpoint}: unchanged, skipping")
+
+                #We only need to read the output back in if a later
+                #stage needs it
+                rows = None
+                inputHash = saved["output"]
+
+                continue
+
+            #If the stage before this one was skipped, read its output
+            if rows is None:
+
+                rows = readRows(stages[i - 1][0])
+
+        if workers > 1 and stages[i][4] is not None:
+
+            rows = stages[i][4](rows, workers)
+
+        else:
+
+            rows = stage(rows)
+
+        if checkpoints:
+
+            writeRows(checkpoint, rows)
+
+        if cache:
+
+            outputHash = getFileHash(checkpoint)
+            hashes[checkpoint] = {"input": inputHash, "rules": rulesHash, "output": outputHash}
+            inputHash = outputHash
+
+            with open(cacheFile, encoding="utf-8", mode="w") as f:
+
+                json.dump(hashes, f, indent = 1)
+
+    #If every stage was skipped, the result is the last checkpoint
+    if rows is None:
+
+        rows = readRows(stages[-1][0])
+
+    return rows
+
+if __name__ == "__main__":
+
+    workers = 1
+
+    if "--workers" in sys.argv:
+
+        workers = int(sys.argv[sys.argv.index("--workers") + 1])
+
+    rows = runPipeline(checkpoints = "--checkpoints" in sys.argv, cache = "--cache" in sys.argv, workers = workers)
+
+    writeRows(stages[-1][0], rows)
+
+    print(f"{len(rows)} verbs parsed")
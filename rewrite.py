@@ -0,0 +1,466 @@
+#This module takes an ordered table of string replacements,
+#like the long chains of s = s.replace(...) in the numbered
+#scripts, and compiles it into a multi-pattern matcher. The
+#text is then rewritten in one left-to-right pass per group
+#of rules, instead of one full pass over the text per rule.
+#The matcher is an Aho-Corasick automaton, so the cost of a
+#pass doesn't depend on how many rules are in it.
+import re
+import time
+
+#This function takes two strings, and returns True if some
+#occurrence of one of them can share characters with some
+#occurrence of the other. That is the case if one contains
+#the other, or if the end of one can be the start of the other.
+def overlap(x, y):
+
+    if x in y or y in x:
+
+        return True
+
+    for i in range(1, min(len(x), len(y))):
+
+        if x.endswith(y[:i]) or y.endswith(x[:i]):
+
+            return True
+
+    return False
+
+#This function takes an earlier rule and a later rule (both
+#(old, new) tuples), and checks whether applying them both in
+#the same pass could give a different result from applying
+#them one after the other, as the old replace chains do. It
+#returns a string explaining the problem, or "" if there is
+#none.
+def interaction(earlier, later):
+
+    oldA, newA = earlier
+    oldB, newB = later
+
+    #The later rule could match text that only exists because
+    #the earlier rule has applied. If the earlier rule deletes
+    #something, anything longer than one character could now
+    #match across the gap. This doesn't matter if the later rule
+    #replaces something by itself, since it never changes the text.
+    if oldB == newB:
+
+        pass
+
+    elif newA == "" and len(oldB) > 1:
+
+        return "deleting " + repr(oldA) + " can create new matches for " + repr(oldB)
+
+    elif newA and overlap(newA, oldB):
+
+        return repr(oldB) + " can match the output of " + repr(oldA) + " -> " + repr(newA)
+
+    #The earlier rule could use up text the later rule would
+    #otherwise have matched first. If the later rule's pattern
+    #sits inside the earlier rule's pattern, there is no problem,
+    #since the earlier (longer) match always wins in a pass.
+    if oldA in oldB and not oldA == oldB:
+
+        return repr(oldA) + " applies before " + repr(oldB) + ", which contains it"
+
+    for i in range(1, min(len(oldA), len(oldB))):
+
+        if oldA.endswith(oldB[:i]) or oldB.endswith(oldA[:i]):
+
+            return "matches of " + repr(oldA) + " and " + repr(oldB) + " can overlap"
+
+    return ""
+
+#A single pass: a set of rules that can all be applied at the
+#same time. Matching is leftmost-longest, and matches don't
+#overlap, which is what str.replace does for a single rule.
+class RewritePass:
+
+    def __init__(self, rules):
+
+        self.rules = rules
+
+        #The trie, stored as one dictionary of transitions per
+        #state, with the failure link and depth of every state,
+        #and the longest rule that ends in each state
+        self.goto = [{}]
+        self.fail = [0]
+        self.depth = [0]
+        self.out = [None]
+
+        for index, (old, new) in enumerate(rules):
+
+            state = 0
+
+            for ch in old:
+
+                if ch not in self.goto[state]:
+
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.depth.append(self.depth[state] + 1)
+                    self.out.append(None)
+                    self.goto[state][ch] = len(self.goto) - 1
+
+                state = self.goto[state][ch]
+
+            #If a pattern occurs twice, the first rule wins, since
+            #the second one would never have anything left to match
+            if self.out[state] is None:
+
+                self.out[state] = index
+
+        #Add failure links breadth-first. Every state also inherits
+        #a match from its failure state if it doesn't have one of
+        #its own, since that's the longest pattern ending here.
+        queue = list(self.goto[0].values())
+
+        for state in queue:
+
+            for ch, nextState in self.goto[state].items():
+
+                f = self.fail[state]
+
+                while f and ch not in self.goto[f]:
+
+                    f = self.fail[f]
+
+                if state and ch in self.goto[f]:
+
+                    self.fail[nextState] = self.goto[f][ch]
+
+                if self.out[nextState] is None:
+
+                    self.out[nextState] = self.out[self.fail[nextState]]
+
+                queue.append(nextState)
+
+        self.maxLength = max([len(old) for old, new in rules])
+
+        #Most of the text can't start a match, so we jump straight
+        #to the next character that can, using a compiled character
+        #class rather than looping over every character in Python
+        self.starts = re.compile("[" + "".join([re.escape(ch) for ch in self.goto[0]]) + "]")
+
+    #Rewrite text, and return the output plus the position in the
+    #text up to which the output is final. If the text is the end
+    #of the input, everything is final. Otherwise, a match that
+    #starts near the end might still continue in the next chunk,
+    #so that part has to be fed in again.
+    def scan(self, text, final = True, hits = None):
+
+        goto = self.goto
+        fail = self.fail
+        depth = self.depth
+        out = self.out
+        rules = self.rules
+        n = len(text)
+
+        output = []
+        last = 0
+        i = 0
+        state = 0
+        candidate = None
+
+        while True:
+
+            if i == n:
+
+                #Nothing can extend the current match any more
+                if candidate is not None and final:
+
+                    start, index = candidate
+                    output.append(text[last:start])
+                    output.append(rules[index][1])
+                    last = i = start + len(rules[index][0])
+                    state = 0
+                    candidate = None
+
+                    if hits is not None:
+
+                        hits[index] += 1
+
+                    continue
+
+                break
+
+            #Skip ahead to somewhere a match could start
+            if state == 0:
+
+                m = self.starts.search(text, i)
+
+                if m is None:
+
+                    i = n
+
+                    continue
+
+                i = m.start()
+
+            ch = text[i]
+
+            while state and ch not in goto[state]:
+
+                state = fail[state]
+
+            state = goto[state].get(ch, 0)
+            i += 1
+
+            if out[state] is not None:
+
+                index = out[state]
+                start = i - len(rules[index][0])
+
+                #Leftmost match wins. If two matches start in the
+                #same place, the longer one wins
+                if candidate is None or start < candidate[0] or (start == candidate[0] and len(rules[index][0]) > len(rules[candidate[1]][0])):
+
+                    candidate = (start, index)
+
+            #Once everything we're still tracking starts after the
+            #candidate, nothing can beat it, so we apply it and
+            #carry on from the end of the match
+            if candidate is not None and i - depth[state] > candidate[0]:
+
+                start, index = candidate
+                output.append(text[last:start])
+                output.append(rules[index][1])
+                last = i = start + len(rules[index][0])
+                state = 0
+                candidate = None
+
+                if hits is not None:
+
+                    hits[index] += 1
+
+        if final:
+
+            output.append(text[last:])
+
+            return ["".join(output), n]
+
+        #Everything before a pending match (or a partial one) is safe
+        safe = n - depth[state]
+
+        if candidate is not None:
+
+            safe = min(safe, candidate[0])
+
+        output.append(text[last:safe])
+
+        return ["".join(output), safe]
+
+#The ordered rule table. Rules are added one at a time with add(),
+#in the order they should apply, and compiled into passes the
+#first time they're used. Consecutive rules share a pass unless
+#one of them could interfere with another, in which case a new
+#pass starts, so the result is always the same as applying the
+#rules one after the other. Rules added with addGroup() always
+#share one pass: this is for large families of rules we know
+#can't interfere with each other on real data, like page numbers.
+#A table can also be instrumented (see instrument), to find out
+#which rules actually apply and how long each pass takes.
+class RewriteRules:
+
+    def __init__(self, rules = []):
+
+        self.rules = []
+        self.groups = []
+        self.passes = None
+        self.passRules = None
+        self.conflicts = []
+        self.ruleHits = None
+        self.passSeconds = None
+
+        for old, new in rules:
+
+            self.add(old, new)
+
+    def add(self, old, new):
+
+        self.rules.append((old, new))
+        self.groups.append(None)
+        self.passes = None
+
+    def addGroup(self, rules):
+
+        group = len(self.rules)
+
+        for old, new in rules:
+
+            self.rules.append((old, new))
+            self.groups.append(group)
+
+        self.passes = None
+
+    #Split the table into passes, and record why each new pass
+    #had to start. The positions in the table of the rules in each
+    #pass are kept in passRules.
+    def compile(self):
+
+        self.passes = []
+        self.passRules = []
+        self.conflicts = []
+        current = []
+        currentGroup = None
+
+        for index, (rule, group) in enumerate(zip(self.rules, self.groups)):
+
+            reason = ""
+
+            if not group == currentGroup:
+
+                reason = "group"
+
+            elif group is None:
+
+                for earlier in current:
+
+                    reason = interaction(earlier, rule)
+
+                    if reason:
+
+                        self.conflicts.append(reason)
+
+                        break
+
+            if reason and current:
+
+                self.passes.append(RewritePass(current))
+                self.passRules.append(list(range(index - len(current), index)))
+                current = []
+
+            current.append(rule)
+            currentGroup = group
+
+        if current:
+
+            self.passes.append(RewritePass(current))
+            self.passRules.append(list(range(len(self.rules) - len(current), len(self.rules))))
+
+        #If rules were added to an instrumented table, the counts
+        #start again
+        if self.ruleHits is not None:
+
+            self.instrument()
+
+        return self
+
+    #Start counting how many times each rule applies, and how long
+    #each pass takes, from now on. The counts are in ruleHits (one
+    #for each rule in the table) and the times in passSeconds (one
+    #for each pass). Rules in the same pass are applied together,
+    #so the time can only be measured for a whole pass.
+    def instrument(self):
+
+        if self.passes is None:
+
+            self.compile()
+
+        self.ruleHits = [0] * len(self.rules)
+        self.passSeconds = [0.0] * len(self.passes)
+
+    #Run one pass over text with scan, adding up its hits and time
+    #if the table is instrumented
+    def scanPass(self, i, text, final = True, hits = None):
+
+        if self.ruleHits is None and hits is None:
+
+            return self.passes[i].scan(text, final)
+
+        passHits = [0] * len(self.passes[i].rules)
+        start = time.perf_counter()
+        result = self.passes[i].scan(text, final, passHits)
+
+        if self.ruleHits is not None:
+
+            self.passSeconds[i] += time.perf_counter() - start
+
+            for index, count in zip(self.passRules[i], passHits):
+
+                self.ruleHits[index] += count
+
+        if hits is not None:
+
+            for rule, count in zip(self.passes[i].rules, passHits):
+
+                hits[rule] = hits.get(rule, 0) + count
+
+        return result
+
+    #Return how often each rule applied and how long each pass took
+    #since instrument was called, as a dictionary that can be saved
+    #as JSON
+    def report(self):
+
+        passes = []
+        rules = []
+
+        for i in range(len(self.passes)):
+
+            passes.append({"pass": i, "rules": len(self.passRules[i]), "hits": sum([self.ruleHits[index] for index in self.passRules[i]]), "seconds": self.passSeconds[i]})
+
+            for index in self.passRules[i]:
+
+                old, new = self.rules[index]
+                rules.append({"rule": index, "old": old, "new": new, "pass": i, "hits": self.ruleHits[index]})
+
+        return {"passes": passes, "rules": rules}
+
+    #Apply every rule to text. If hits is a dictionary, the number
+    #of times each rule applied is added to it, keyed by (old, new).
+    def rewrite(self, text, hits = None):
+
+        if self.passes is None:
+
+            self.compile()
+
+        for i in range(len(self.passes)):
+
+            text = self.scanPass(i, text, hits = hits)[0]
+
+        return text
+
+    #Apply every rule to text that arrives in chunks (e.g. lines
+    #read from a file), yielding rewritten chunks as soon as they're
+    #final. The output joined together is the same as rewrite()
+    #on the input joined together.
+    def rewriteStream(self, chunks):
+
+        if self.passes is None:
+
+            self.compile()
+
+        for i in range(len(self.passes)):
+
+            chunks = self.streamPass(i, chunks)
+
+        return chunks
+
+    def streamPass(self, i, chunks):
+
+        p = self.passes[i]
+
+        carry = ""
+
+        for chunk in chunks:
+
+            carry += chunk
+
+            #Don't bother scanning until there is enough text for
+            #a match to be decided
+            if len(carry) < 4 * p.maxLength:
+
+                continue
+
+            output, safe = self.scanPass(i, carry, final = False)
+            carry = carry[safe:]
+
+            if output:
+
+                yield output
+
+        output = self.scanPass(i, carry)[0]
+
+        if output:
+
+            yield output
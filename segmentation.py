@@ -0,0 +1,180 @@
+#This module contains the automatic morpheme parsing used by
+#5. Fix morpheme boundaries.py. Morphemes from the whole corpus
+#are stored once in a trie, along with how often each one occurs.
+#A morpheme is then broken down into smaller morphemes by dynamic
+#programming over the trie, and we get back the positions of the
+#new boundaries. From each position in the morpheme we walk the
+#trie as far as it goes, so this takes time quadratic in the
+#morpheme's length at worst, bounded by the longest morpheme in
+#the lexicon.
+from math import log
+
+#Morphemes we know already, which seed the lexicon
+seeds = ["уа", "уе", "ит", "кәа", "уА", "уЕ", "кәА"]
+
+#A trie of morphemes. Each node is a dictionary from the next
+#character to the next node, and the key "" stores how many times
+#the morpheme ending at that node was seen.
+class MorphemeTrie:
+
+    def __init__(self):
+
+        self.root = {}
+
+    def add(self, m, count = 1):
+
+        node = self.root
+
+        for ch in m:
+
+            node = node.setdefault(ch, {})
+
+        node[""] = node.get("", 0) + count
+
+    def count(self, m):
+
+        node = self.root
+
+        for ch in m:
+
+            if ch not in node:
+
+                return 0
+
+            node = node[ch]
+
+        return node.get("", 0)
+
+    #Yield (end, count) for every morpheme in the trie that starts
+    #at position start in s, shortest first
+    def prefixes(self, s, start):
+
+        node = self.root
+
+        for end in range(start, len(s)):
+
+            if s[end] not in node:
+
+                return
+
+            node = node[s[end]]
+
+            if "" in node:
+
+                yield end + 1, node[""]
+
+#This function takes a list of rows (each a list of verb forms),
+#and returns a MorphemeTrie of all their morphemes plus the seeds.
+#I'm ignoring the masdar here, because there's some annoying
+#overparsing based on small morphemes like а- and -ра
+def buildLexicon(rows):
+
+    lexicon = MorphemeTrie()
+
+    for m in seeds:
+
+        lexicon.add(m)
+
+    for tf in rows:
+
+        for item in tf[1:]:
+
+            for m in item.split("-"):
+
+                lexicon.add(m)
+
+    return lexicon
+
+#This function takes a morpheme m, a MorphemeTrie, and a set of
+#morphemes we allow m to be broken into. It returns a list of the
+#positions in m where boundaries should go, or an empty list if
+#m can't be broken down. Of all the ways to break m into allowed
+#morphemes, we take the one with the fewest pieces, and if there's
+#a tie, the one whose pieces are most frequent in the corpus. This
+#keeps us from overparsing into lots of little morphemes.
+def segment(m, lexicon, allowed):
+
+    #best[i] is the best way found so far to break down m[:i],
+    #as (number of pieces, cost), where cost is lower for more
+    #frequent pieces. back[i] is where the last piece starts.
+    best = [None] * (len(m) + 1)
+    back = [0] * (len(m) + 1)
+    best[0] = (0, 0)
+
+    for i in range(len(m)):
+
+        if best[i] is None:
+
+            continue
+
+        for j, count in lexicon.prefixes(m, i):
+
+            piece = m[i:j]
+
+            #m itself is always in the lexicon, so we skip it
+            if j - i == len(m) or piece not in allowed:
+
+                continue
+
+            candidate = (best[i][0] + 1, best[i][1] - log(count))
+
+            if best[j] is None or candidate < best[j]:
+
+                best[j] = candidate
+                back[j] = i
+
+    if best[-1] is None:
+
+        return []
+
+    positions = []
+    i = back[-1]
+
+    while i > 0:
+
+        positions.append(i)
+        i = back[i]
+
+    return positions[::-1]
+
+#This function takes a list of verb forms and a MorphemeTrie as
+#input, and tries to see if any morphemes contained within each
+#form can be broken down into other morphemes from the forms. It
+#returns the result as a list
+def reparse(tf, lexicon):
+
+    #The morphemes a morpheme can be broken into are the ones in
+    #this verb's forms (ignoring the masdar, as above) and the seeds
+    allowed = set(seeds)
+
+    for item in tf[1:]:
+
+        allowed.update(item.split("-"))
+
+    output = []
+
+    for item in tf:
+
+        morphemes = []
+
+        for m in item.split("-"):
+
+            #Technically 2-character strings could be
+            #morphologically complex, but I restrict
+            #myself to length 3 or more to prevent
+            #too much overparsing
+            if len(m) > 2 and m in allowed:
+
+                positions = segment(m, lexicon, allowed)
+
+                for start, end in zip([0] + positions, positions + [len(m)]):
+
+                    morphemes.append(m[start:end])
+
+            else:
+
+                morphemes.append(m)
+
+        output.append("-".join(morphemes))
+
+    return output
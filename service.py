@@ -0,0 +1,325 @@
+#This module runs a small HTTP server on this machine which keeps
+#everything loaded between requests: the transliteration and
+#phonology tables, the paradigm templates (compiled into the form
+#analyzer, see analyzer.py), and the hand-corrected corpus, with
+#Dybo's Rule already evaluated on every verb in it. Tools that need
+#these thousands of times can then send requests to it, instead of
+#running a script that builds everything again every time.
+#Every request is a POST with a JSON body, and gets a JSON answer.
+#Each request can have as many items as you like:
+#/transliterate  {"texts": [...]}   dictionary transcription to orthography
+#/phonology      {"forms": [...]}   orthography to phonology
+#/analyze        {"forms": [...]}   segment and gloss forms
+#/evaluate       {"verbs": [...]}   Dybo's Rule, by masdar (as in the corpus)
+#                                   or by position in the corpus
+#                {"lines": [...]}   Dybo's Rule, on lines in the corpus format
+#Some masdars are shared by several verbs, so a masdar gets a result
+#for every verb with it, each with its position in the corpus.
+#/evaluate can also be given "status", a dictionary of functional
+#morpheme accents ("A" or "U") to use instead of accentStatus in
+#dybo.py. A request that isn't in this shape gets a 400 answer.
+#GET /stats returns how many requests and items each operation has
+#had, and how long they took. Run it with:
+#python service.py [--host HOST] [--port PORT]
+import os
+import sys
+import json
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from orthography import transliterator
+from phonology import getPhonology
+from analyzer import loadAnalyzer
+
+#The evaluator lives with the hand-corrected corpus
+corpusFolder = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Hand-corrected corpus")
+sys.path.append(corpusFolder)
+
+from corpus import Form, Verb, loadCorpus, parseVerb
+from dybo import accentStatus, evaluateVerb
+
+corpusFile = os.path.join(corpusFolder, "Corpus.txt")
+
+host = "127.0.0.1"
+port = 8765
+
+#Counters for each operation: requests, items, errors, and the
+#total and longest time spent answering a request
+class Counters:
+
+    def __init__(self, operations):
+
+        self.lock = threading.Lock()
+        self.started = time.time()
+        self.counts = {name: {"requests": 0, "items": 0, "errors": 0, "seconds": 0.0, "maxSeconds": 0.0} for name in operations}
+
+    def add(self, name, items, seconds, error = False):
+
+        with self.lock:
+
+            counts = self.counts[name]
+            counts["requests"] += 1
+            counts["items"] += items
+            counts["errors"] += int(error)
+            counts["seconds"] += seconds
+            counts["maxSeconds"] = max(counts["maxSeconds"], seconds)
+
+    #Return the counters, with the mean latency and the throughput
+    #of each operation worked out
+    def report(self):
+
+        with self.lock:
+
+            operations = {}
+
+            for name, counts in self.counts.items():
+
+                operations[name] = dict(counts)
+                operations[name]["meanSeconds"] = counts["seconds"] / counts["requests"] if counts["requests"] else 0.0
+                operations[name]["itemsPerSecond"] = counts["items"] / counts["seconds"] if counts["seconds"] else 0.0
+
+        return {"uptime": time.time() - self.started, "operations": operations}
+
+#This function takes a request and the name of one of its fields,
+#and returns the field, checking that it's a list of strings (or of
+#the types given). If it's missing, it's an empty list, unless it's
+#required.
+def getList(request, field, types = (str,), required = False):
+
+    if field not in request and not required:
+
+        return []
+
+    items = request[field]
+
+    if not isinstance(items, list) or not all([isinstance(item, types) and not isinstance(item, bool) for item in items]):
+
+        raise ValueError(f"{field} must be a list of {' or '.join([t.__name__ for t in types])}")
+
+    return items
+
+#Evaluating a verb changes its forms (see prepareVerb in dybo.py),
+#so we evaluate a copy, and keep the verb as it was in the corpus
+def copyVerb(verb):
+
+    forms = tuple([Form(f.orthography, f.phonology, f.glosses, f.stressIndices) for f in verb.forms])
+
+    return Verb(forms, verb.glossString, verb.stressInfo, verb.translation, verb.causative)
+
+#Everything the service keeps loaded, and the operations it offers.
+#Each operation takes the JSON body of a request, and returns the
+#number of items in it and the JSON answer.
+class Service:
+
+    def __init__(self):
+
+        self.analyzer = loadAnalyzer(corpusFile)
+
+        #The verbs in the corpus and their evaluations, by position,
+        #and the positions of the verbs with each masdar
+        self.verbs = list(loadCorpus(corpusFile))
+        self.evaluations = []
+        self.positions = {}
+
+        for index in range(len(self.verbs)):
+
+            record = {"index": index}
+            record.update(evaluateVerb(copyVerb(self.verbs[index])))
+            self.evaluations.append(record)
+            self.positions.setdefault(self.verbs[index].name(), []).append(index)
+
+        self.operations = {
+            "transliterate": self.transliterate,
+            "phonology": self.phonology,
+            "analyze": self.analyze,
+            "evaluate": self.evaluate
+            }
+
+        self.counters = Counters(self.operations)
+
+    def transliterate(self, request):
+
+        texts = getList(request, "texts", required = True)
+
+        return [len(texts), {"results": transliterator.transliterateBatch(texts)}]
+
+    def phonology(self, request):
+
+        forms = getList(request, "forms", required = True)
+
+        return [len(forms), {"results": [getPhonology(form) for form in forms]}]
+
+    def analyze(self, request):
+
+        forms = getList(request, "forms", required = True)
+        results = []
+
+        for form in forms:
+
+            results.append([{"morphemes": a.morphemes, "glosses": a.glosses, "categories": a.categories} for a in self.analyzer.analyze(form)])
+
+        return [len(forms), {"results": results}]
+
+    #Verbs from the corpus with the usual accents were evaluated when
+    #the service started; anything else is evaluated now
+    def evaluate(self, request):
+
+        status = dict(accentStatus)
+        status.update(self.getStatus(request))
+        verbs = getList(request, "verbs", (str, int))
+        lines = getList(request, "lines")
+        results = []
+
+        for line in lines:
+
+            if not len(line.split("\t")) == 25:
+
+                raise ValueError(f"Lines must have 25 tab-separated columns, like the corpus: {line!r}")
+
+        for verb in verbs:
+
+            if isinstance(verb, int):
+
+                indices = [verb] if 0 <= verb < len(self.verbs) else []
+
+            else:
+
+                indices = self.positions.get(verb, [])
+
+            if not indices:
+
+                results.append({"verb": verb, "problem": "NOT IN CORPUS"})
+
+            for index in indices:
+
+                if status == accentStatus:
+
+                    results.append(self.evaluations[index])
+
+                else:
+
+                    record = {"index": index}
+                    record.update(evaluateVerb(copyVerb(self.verbs[index]), status))
+                    results.append(record)
+
+        for line in lines:
+
+            results.append(evaluateVerb(parseVerb(line), status))
+
+        return [len(results), {"results": results}]
+
+    #Return the accents given in a request, checking that they're all
+    #for morphemes in accentStatus, and all "A" or "U"
+    def getStatus(self, request):
+
+        status = request.get("status", {})
+
+        if not isinstance(status, dict):
+
+            raise ValueError("status must be a dictionary from morphemes to \"A\" or \"U\"")
+
+        for morpheme, accent in status.items():
+
+            if morpheme not in accentStatus:
+
+                raise ValueError(f"status has an accent for {morpheme}, which isn't one of {', '.join(accentStatus)}")
+
+            if accent not in ["A", "U"]:
+
+                raise ValueError(f"status gives {morpheme} the accent {accent!r}, which isn't \"A\" or \"U\"")
+
+        return status
+
+    #This function takes the name of an operation and the body of a
+    #request, and returns the HTTP status and the JSON answer. Requests
+    #that aren't in the right shape get 400; anything else that goes
+    #wrong gets 500, so the client always gets an answer.
+    def handle(self, name, body):
+
+        start = time.perf_counter()
+
+        try:
+
+            items, answer = self.operations[name](json.loads(body))
+            status = 200
+
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+
+            items, answer = 0, {"error": f"{type(e).__name__}: {e}"}
+            status = 400
+
+        except Exception as e:
+
+            items, answer = 0, {"error": f"{type(e).__name__}: {e}"}
+            status = 500
+
+        self.counters.add(name, items, time.perf_counter() - start, status != 200)
+
+        return [status, answer]
+
+class RequestHandler(BaseHTTPRequestHandler):
+
+    #Set to the Service when the server starts
+    service = None
+
+    def send(self, status, answer):
+
+        data = json.dumps(answer, ensure_ascii = False).encode("utf-8")
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+
+        if self.path == "/stats":
+
+            self.send(200, self.service.counters.report())
+
+        else:
+
+            self.send(404, {"error": f"No such page: {self.path}"})
+
+    def do_POST(self):
+
+        name = self.path.strip("/")
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+        if name in self.service.operations:
+
+            self.send(*self.service.handle(name, body))
+
+        else:
+
+            self.send(404, {"error": f"No such operation: {name}"})
+
+    #Don't print a line for every request
+    def log_message(self, format, *args):
+
+        pass
+
+if __name__ == "__main__":
+
+    if "--host" in sys.argv:
+
+        host = sys.argv[sys.argv.index("--host") + 1]
+
+    if "--port" in sys.argv:
+
+        port = int(sys.argv[sys.argv.index("--port") + 1])
+
+    RequestHandler.service = Service()
+    server = ThreadingHTTPServer((host, port), RequestHandler)
+
+    print(f"Listening on http://{host}:{port}")
+
+    try:
+
+        server.serve_forever()
+
+    except KeyboardInterrupt:
+
+        server.server_close()
@@ -0,0 +1,31 @@
+#This module contains the stress check from 3. Fix verb stress.py,
+#as a filter that looks at one row at a time. Rows that pass are
+#handed on straight away, so it can be chained with other steps
+#without writing anything to a file in between.
+
+#This function takes a row (a list of tab-separated fields), and
+#returns True if the row should be kept. We skip the column that
+#has glosses.
+def keepRow(row):
+
+    for verb in row[:-1]:
+
+        #Forms that have no stress need to have their
+        #rows thrown out. Same goes for forms with stress
+        #on aa. Stress is marked by ¡
+        if "¡" not in verb or "a¡a" in verb or "aa¡" in verb:
+
+            return False
+
+    return True
+
+#This function takes rows (e.g. a list, or a generator from an
+#earlier step), and yields the ones that pass the stress check.
+#Empty rows are dropped too, since they don't contain a verb.
+def filterRows(rows):
+
+    for row in rows:
+
+        if row and row != [""] and keepRow(row):
+
+            yield row